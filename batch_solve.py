@@ -0,0 +1,181 @@
+"""Headless batch solver.
+
+Reads start states from a file (one per line, comma-separated, e.g.
+``8,6,7,2,5,4,3,0,1``; 16 values for the 15-puzzle and so on), solves them on a process pool and streams one JSON
+object per state to the output as results complete::
+
+    python batch_solve.py states.txt --algorithm astar --workers 8 -o out.jsonl
+
+This module only depends on the solver, never on PyQt5, so it starts fast
+and runs on machines without a display.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from puzzle_solver import PuzzleSolver, board_width
+from solution_cache import SolutionCache
+
+
+ALGORITHMS = {
+    'bfs': PuzzleSolver.bfs,
+    'bfs_numpy': PuzzleSolver.layered_bfs,
+    'dfs': PuzzleSolver.dfs,
+    'iddfs': PuzzleSolver.iddfs,
+    'ucs': PuzzleSolver.ucs,
+    'bidirectional': PuzzleSolver.bidirectional_bfs,
+    'astar': PuzzleSolver.astar,
+    'ida_star': PuzzleSolver.ida_star,
+    'anytime_astar': PuzzleSolver.anytime_astar,
+    'table': PuzzleSolver.solve_optimal,
+}
+
+
+def parse_state(text: str) -> List[int]:
+    try:
+        state = [int(value) for value in text.split(',')]
+    except ValueError:
+        raise ValueError(f"Not a comma-separated list of integers: {text!r}") from None
+    board_width(len(state))
+    if set(state) != set(range(len(state))):
+        raise ValueError(f"State must contain numbers from 0 to {len(state) - 1} in any order.")
+    if not PuzzleSolver.is_solvable(state):
+        raise ValueError("State is unsolvable: no sequence of moves reaches the goal.")
+    return state
+
+
+def read_states(lines) -> Iterator[Tuple[int, str]]:
+    """Yield ``(line_number, text)`` for every non-blank, non-comment line."""
+    for line_number, line in enumerate(lines, 1):
+        text = line.strip()
+        if text and not text.startswith('#'):
+            yield line_number, text
+
+
+def solve_line(algorithm: str, item: Tuple[int, str]) -> dict:
+    line_number, text = item
+    record = {'line': line_number, 'algorithm': algorithm}
+    try:
+        state = parse_state(text)
+    except ValueError as e:
+        record.update(state=text, error=str(e))
+        return record
+
+    start_time = time.perf_counter()
+    record['state'] = state
+    try:
+        if _cache is None:
+            result = ALGORITHMS[algorithm](state)
+        else:
+            hits = _cache.hits
+            result = _cache.solve(ALGORITHMS[algorithm], state, algorithm)
+            record['cached'] = _cache.hits > hits
+    except ValueError as e:
+        # The algorithm cannot handle this board (e.g. the distance table on 4x4).
+        record['error'] = str(e)
+        return record
+    record['wall_time'] = time.perf_counter() - start_time
+    if result is None:
+        record.update(solved=False, moves=None, path_length=None, nodes_explored=None)
+    else:
+        path, _, nodes_explored = result
+        record.update(solved=True, moves=path, path_length=len(path),
+                      nodes_explored=nodes_explored)
+    return record
+
+
+# Per-process solution cache, set by _init_worker when --cache is given.
+_cache: Optional[SolutionCache] = None
+
+
+def _init_worker(cache: Optional[SolutionCache]) -> None:
+    global _cache
+    _cache = cache
+
+
+class _LineSolver:
+    """Picklable ``solve_line`` bound to one algorithm, for ``Pool.imap``."""
+
+    def __init__(self, algorithm: str):
+        self.algorithm = algorithm
+
+    def __call__(self, item: Tuple[int, str]) -> dict:
+        return solve_line(self.algorithm, item)
+
+
+def solve_file(lines, output, algorithm: str = 'astar', workers: Optional[int] = None,
+               chunksize: int = 16, cache: Optional[SolutionCache] = None) -> int:
+    """Solve every state in ``lines`` and write JSON Lines to ``output``.
+
+    Results are written in completion order as soon as each chunk finishes.
+    With a ``cache``, every worker starts from a copy of it and skips the
+    search on hits; new solutions are added to ``cache`` as they arrive.
+    Returns the number of records written.
+    """
+    if algorithm == 'table':
+        # Build or map the cache file once up front instead of in every worker.
+        from puzzle_solver.distance_table import get_distance_table
+        get_distance_table()
+
+    solve = _LineSolver(algorithm)
+    written = 0
+    if workers == 1:
+        _init_worker(cache)
+        try:
+            for record in map(solve, read_states(lines)):
+                output.write(json.dumps(record) + '\n')
+                output.flush()
+                written += 1
+        finally:
+            _init_worker(None)
+        return written
+
+    with multiprocessing.Pool(workers, _init_worker, (cache,)) as pool:
+        for record in pool.imap_unordered(solve, read_states(lines), chunksize):
+            if cache is not None and 'error' not in record and not record['cached']:
+                cache.store(algorithm, record['state'], record['moves'])
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+            written += 1
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Solve sliding-puzzle start states in bulk.")
+    parser.add_argument('input', help="file with one comma-separated state per line, or - for stdin")
+    parser.add_argument('-a', '--algorithm', choices=sorted(ALGORITHMS), default='astar')
+    parser.add_argument('-o', '--output', default='-', help="JSON Lines output file (default: stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count; 1 solves in-process)")
+    parser.add_argument('-c', '--chunksize', type=int, default=16,
+                        help="states handed to a worker at a time")
+    parser.add_argument('--cache', metavar='FILE',
+                        help="reuse and extend a solution cache stored in FILE")
+    parser.add_argument('--cache-size', type=int, default=100000,
+                        help="most solutions kept in the cache (default: 100000)")
+    args = parser.parse_args(argv)
+
+    infile = sys.stdin if args.input == '-' else open(args.input)
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w')
+    cache = SolutionCache(args.cache_size, args.cache) if args.cache else None
+    start_time = time.perf_counter()
+    try:
+        count = solve_file(infile, outfile, args.algorithm, args.workers, args.chunksize, cache)
+        if cache is not None:
+            cache.save()
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    print(f"Wrote {count} results in {time.perf_counter() - start_time:.2f} seconds",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""Solver benchmark harness.
+
+Builds a seeded set of start states stratified by optimal solution depth,
+runs every requested algorithm over it and reports, per algorithm and depth,
+nodes explored, nodes/sec, peak traced memory and p50/p95/p99 latency::
+
+    python benchmark.py --depths 0-24 --per-depth 5 -o results.json
+    python benchmark.py --baseline results.json   # exits 1 on regression
+    python benchmark.py --cold-start 10           # startup times instead
+
+Results are plain JSON so they can be committed as a baseline and diffed.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from batch_solve import ALGORITHMS
+from instance_generator import random_state, states_at_depth
+
+
+MAX_DEPTH = 31
+RESULTS_VERSION = 1
+# Timing differences smaller than this are scheduler noise, not regressions.
+NOISE_FLOOR = 0.002
+
+
+def parse_depths(text: str) -> List[int]:
+    """Parse ``"0-31"``, ``"5,10,20"`` or a mix of both."""
+    depths = set()
+    for part in text.split(','):
+        low, _, high = part.partition('-')
+        depths.update(range(int(low), int(high or low) + 1))
+    if not depths or min(depths) < 0 or max(depths) > MAX_DEPTH:
+        raise ValueError(f"Depths must lie between 0 and {MAX_DEPTH}")
+    return sorted(depths)
+
+
+def generate_instances(depths: List[int], per_depth: int, seed: int,
+                       random_count: int = 0) -> Dict[str, List[List[int]]]:
+    """Reproducible instance set: ``per_depth`` states for every depth in
+    ``depths`` plus, when ``random_count`` is set, a ``random`` stratum drawn
+    uniformly from all solvable states."""
+    rng = random.Random(seed)
+    instances = {}
+    for depth in depths:
+        # Depth 0 and 31 have fewer states than a typical per_depth value.
+        instances[str(depth)] = states_at_depth(depth, per_depth, rng, method='table')
+    if random_count:
+        instances['random'] = [random_state(rng) for _ in range(random_count)]
+    return instances
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(len(sorted_values) * fraction))
+    return sorted_values[rank - 1]
+
+
+def run_one(solve, state: List[int], measure_memory: bool) -> dict:
+    start_time = time.perf_counter()
+    result = solve(state)
+    elapsed = time.perf_counter() - start_time
+
+    peak_memory = None
+    if measure_memory:
+        # A second, traced run: tracemalloc slows allocation-heavy searches
+        # too much to share a run with the latency measurement.
+        tracemalloc.start()
+        try:
+            solve(state)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    path, _, nodes_explored = result
+    return {
+        'latency': elapsed,
+        'nodes_explored': nodes_explored,
+        'path_length': len(path),
+        'peak_memory': peak_memory,
+    }
+
+
+def summarize(runs: List[dict]) -> dict:
+    latencies = sorted(run['latency'] for run in runs)
+    total_time = sum(latencies)
+    total_nodes = sum(run['nodes_explored'] for run in runs)
+    memory = [run['peak_memory'] for run in runs if run['peak_memory'] is not None]
+    return {
+        'instances': len(runs),
+        'nodes_explored': total_nodes,
+        'total_time': total_time,
+        'nodes_per_second': total_nodes / total_time if total_time > 0 else 0.0,
+        'mean_path_length': sum(run['path_length'] for run in runs) / len(runs),
+        'peak_memory': max(memory) if memory else None,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+    }
+
+
+def run_benchmark(algorithms: List[str], instances: Dict[str, List[List[int]]],
+                  measure_memory: bool = True, log=None) -> Dict[str, Dict[str, dict]]:
+    results = {}
+    for algorithm in algorithms:
+        solve = ALGORITHMS[algorithm]
+        results[algorithm] = {}
+        all_runs = []
+        for stratum, states in instances.items():
+            if not states:
+                continue
+            runs = [run_one(solve, state, measure_memory) for state in states]
+            all_runs.extend(runs)
+            results[algorithm][stratum] = summarize(runs)
+            if log:
+                summary = results[algorithm][stratum]
+                log(f"{algorithm:>13} {stratum:>6}: {summary['nodes_per_second']:>10,.0f} nodes/s"
+                    f"  p50 {summary['p50'] * 1000:8.2f} ms  p99 {summary['p99'] * 1000:8.2f} ms")
+        if all_runs:
+            results[algorithm]['all'] = summarize(all_runs)
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """List human-readable regressions of ``current`` against ``baseline``.
+
+    Node counts are deterministic for a given instance set, so any increase
+    is reported; throughput, latency and memory only beyond ``tolerance``
+    (a fraction, e.g. 0.2 for 20%), and timings only when the difference
+    is above NOISE_FLOOR.
+    """
+    regressions = []
+    if current['meta']['instances_hash'] != baseline['meta']['instances_hash']:
+        regressions.append("instance sets differ; rerun the baseline with the same "
+                           "--seed/--depths/--per-depth")
+        return regressions
+
+    for algorithm, strata in current['results'].items():
+        for stratum, now in strata.items():
+            before = baseline['results'].get(algorithm, {}).get(stratum)
+            if before is None:
+                continue
+            label = f"{algorithm}/{stratum}"
+            if now['nodes_explored'] > before['nodes_explored']:
+                regressions.append(f"{label}: nodes explored {before['nodes_explored']} "
+                                   f"-> {now['nodes_explored']}")
+            if (now['nodes_per_second'] < before['nodes_per_second'] * (1 - tolerance)
+                    and before['total_time'] >= NOISE_FLOOR):
+                regressions.append(f"{label}: nodes/sec {before['nodes_per_second']:,.0f} "
+                                   f"-> {now['nodes_per_second']:,.0f}")
+            for key in ('p50', 'p95', 'p99'):
+                if (now[key] > before[key] * (1 + tolerance)
+                        and now[key] - before[key] > NOISE_FLOOR):
+                    regressions.append(f"{label}: {key} {before[key] * 1000:.2f} ms "
+                                       f"-> {now[key] * 1000:.2f} ms")
+            if (now['peak_memory'] is not None and before['peak_memory'] is not None
+                    and now['peak_memory'] > before['peak_memory'] * (1 + tolerance)):
+                regressions.append(f"{label}: peak memory {before['peak_memory']:,} B "
+                                   f"-> {now['peak_memory']:,} B")
+    return regressions
+
+
+# Programs timed by --cold-start, each in a fresh interpreter.  The GUI one
+# builds and shows the main window, then exits without entering the event loop.
+COLD_START_PROGRAMS = {
+    'interpreter': "pass",
+    'solver_import': "import puzzle_solver",
+    'headless_solve': ("from puzzle_solver import PuzzleSolver\n"
+                       "PuzzleSolver.astar([8, 6, 7, 2, 5, 4, 3, 0, 1])"),
+    'gui': ("import sys\n"
+            "from PyQt5.QtWidgets import QApplication\n"
+            "app = QApplication(sys.argv)\n"
+            "import main\n"
+            "window = main.ModernPuzzleGUI()\n"
+            "window.show()\n"
+            "app.processEvents()"),
+}
+
+
+def cold_start(runs: int = 5, log=None) -> Dict[str, dict]:
+    """Median and best wall time of each COLD_START_PROGRAMS entry over
+    ``runs`` fresh interpreters.  The GUI is skipped without PyQt5 and
+    rendered offscreen when there is no display."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        filter(None, [here, os.environ.get('PYTHONPATH')])))
+    if not (env.get('DISPLAY') or env.get('WAYLAND_DISPLAY')):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    results = {}
+    for name, program in COLD_START_PROGRAMS.items():
+        times = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            completed = subprocess.run([sys.executable, '-c', program], cwd=here, env=env,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start_time)
+            if completed.returncode != 0:
+                break
+        if completed.returncode != 0:
+            if log:
+                log(f"{name:>15}: skipped (exit status {completed.returncode})")
+            continue
+        times.sort()
+        results[name] = {'runs': runs, 'median': percentile(times, 0.5), 'best': times[0]}
+        if log:
+            log(f"{name:>15}: median {results[name]['median'] * 1000:7.1f} ms"
+                f"  best {times[0] * 1000:7.1f} ms")
+    return results
+
+
+def _instances_hash(instances: Dict[str, List[List[int]]]) -> str:
+    return hashlib.sha1(json.dumps(instances, sort_keys=True).encode()).hexdigest()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the puzzle solvers.")
+    parser.add_argument('-a', '--algorithms', default=','.join(ALGORITHMS),
+                        help="comma-separated subset of: " + ', '.join(ALGORITHMS))
+    parser.add_argument('--depths', default=f"0-{MAX_DEPTH}",
+                        help="optimal depths to sample, e.g. 0-31 or 10,20,30")
+    parser.add_argument('--per-depth', type=int, default=3, help="instances per depth")
+    parser.add_argument('--random', type=int, default=0,
+                        help="extra uniformly random instances in a 'random' stratum")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the traced run used for peak memory")
+    parser.add_argument('-o', '--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="compare against a stored results file")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative slowdown/memory growth (default 0.25)")
+    parser.add_argument('--cold-start', type=int, metavar='RUNS',
+                        help="only time interpreter, solver import, headless solve and GUI "
+                             "startup, each over RUNS fresh processes")
+    args = parser.parse_args(argv)
+    log = lambda line: print(line, file=sys.stderr)
+
+    if args.cold_start:
+        results = cold_start(args.cold_start, log)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'cold_start': results}, f, indent=2)
+        return 0
+
+    algorithms = args.algorithms.split(',')
+    unknown = [name for name in algorithms if name not in ALGORITHMS]
+    if unknown:
+        parser.error(f"unknown algorithm(s): {', '.join(unknown)}")
+
+    instances = generate_instances(parse_depths(args.depths), args.per_depth,
+                                   args.seed, args.random)
+    results = {
+        'meta': {
+            'version': RESULTS_VERSION,
+            'seed': args.seed,
+            'depths': args.depths,
+            'per_depth': args.per_depth,
+            'random': args.random,
+            'instances_hash': _instances_hash(instances),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': run_benchmark(algorithms, instances, not args.no_memory, log),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
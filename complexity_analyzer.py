@@ -1,3 +1,8 @@
+from typing import Optional
+
+from puzzle_solver import SearchStats
+
+
 class ComplexityAnalyzer:
     def __init__(self):
         self.complexity_map = {
@@ -9,13 +14,44 @@ class ComplexityAnalyzer:
                 'time': 'O(b^m)',  # b: branching factor, m: maximum depth
                 'space': 'O(bm)'
             },
+            'IDDFS': {
+                'time': 'O(b^d)',  # every iteration repeats the shallower ones
+                'space': 'O(d + t)'  # current path plus the bounded transposition table
+            },
             'UCS': {
                 'time': 'O(b^(1 + C/ε))',  # C: cost of optimal solution, ε: minimum cost increment
                 'space': 'O(b^(1 + C/ε))'
+            },
+            'Bidirectional BFS': {
+                'time': 'O(b^(d/2))',  # two searches meeting halfway
+                'space': 'O(b^(d/2))'
+            },
+            'A*': {
+                'time': 'O(b^d)',  # exponential only in the heuristic's error in practice
+                'space': 'O(b^d)'
+            },
+            'IDA*': {
+                'time': 'O(b^d)',
+                'space': 'O(d)'  # only the current path is kept
+            },
+            'Distance Table': {
+                'time': 'O(d)',  # one table lookup per neighbour along the path
+                'space': 'O(9!/2)'  # one byte per reachable state, memory-mapped
+            },
+            'Portfolio': {
+                'time': 'O(b^d)',  # the fastest of A*, bidirectional BFS and IDA* on this instance
+                'space': 'O(b^d)'
             }
         }
 
-    def analyze(self, algorithm: str, nodes_explored: int, path_length: int) -> dict:
+    def analyze(self, algorithm: str, nodes_explored: int, path_length: int,
+                stats: Optional[SearchStats] = None) -> dict:
+        """Describe a finished search.  Without ``stats`` (or when the search
+        expanded nothing, e.g. a cache hit) this is the algorithm's Big-O;
+        with them, the measured effective branching factor and memory."""
+        if stats is not None and stats.expanded:
+            return self.measure(stats, path_length)
+
         base_complexity = self.complexity_map.get(algorithm, {
             'time': 'Unknown',
             'space': 'Unknown'
@@ -27,3 +63,43 @@ class ComplexityAnalyzer:
         }
         
         return complexity
+
+    def measure(self, stats: SearchStats, path_length: int) -> dict:
+        branching = self.effective_branching_factor(stats.generated, path_length)
+        time_text = (f"b* = {branching:.2f} over {path_length} moves "
+                     f"({stats.expanded:,} expanded, {stats.generated:,} generated, "
+                     f"{stats.duplicates:,} duplicates)")
+        space_text = f"{stats.max_stored:,} nodes held, frontier peak {stats.max_frontier:,}"
+        if stats.peak_memory is not None:
+            space_text += f", {stats.peak_memory / 2 ** 20:.1f} MiB traced"
+        return {
+            'time': time_text,
+            'space': space_text,
+            'effective_branching_factor': branching,
+            'expanded': stats.expanded,
+            'generated': stats.generated,
+            'duplicates': stats.duplicates,
+            'heuristic_evaluations': stats.heuristic_evaluations,
+            'max_frontier': stats.max_frontier,
+            'max_stored': stats.max_stored,
+            'peak_memory': stats.peak_memory,
+            'depth_counts': list(stats.depth_counts),
+            'expansion_time': stats.expansion_time,
+            'bookkeeping_time': stats.bookkeeping_time,
+        }
+
+    @staticmethod
+    def effective_branching_factor(generated: int, depth: int) -> float:
+        """The b* of a uniform tree of depth ``depth`` holding as many nodes
+        as were generated: N + 1 = 1 + b* + b*^2 + ... + b*^depth."""
+        if depth <= 0 or generated <= 0:
+            return 0.0
+        target = generated + 1
+        low, high = 0.0, target ** (1 / depth) + 1
+        for _ in range(60):  # bisection down to float precision
+            middle = (low + high) / 2
+            if sum(middle ** i for i in range(depth + 1)) < target:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
@@ -0,0 +1,173 @@
+"""Random start states, uniform over all solvable states or at an exact
+optimal solution depth::
+
+    python instance_generator.py --count 10000 --depth 24 --seed 7 > states.txt
+    python batch_solve.py states.txt -a astar -o out.jsonl
+
+Solvable states are numbered ``0 .. (n!/2 - 1)`` the way
+``puzzle_solver.distance_table`` indexes them, on any board width, so a
+uniform random number unranks to a uniform random solvable state with no
+retries.
+"""
+import argparse
+import random
+import sys
+from math import factorial
+from typing import List, Optional
+
+from puzzle_solver import PuzzleSolver, board_width, encode_state, get_board
+from puzzle_solver.distance_table import get_distance_table, state_from_index, state_index
+
+
+def solvable_count(width: int = 3) -> int:
+    """Number of solvable states on a ``width`` x ``width`` board."""
+    return factorial(width * width) // 2
+
+
+def unrank_state(rank: int, width: int = 3) -> List[int]:
+    """The solvable state numbered ``rank`` (see the module docstring)."""
+    count = solvable_count(width)
+    if not 0 <= rank < count:
+        raise ValueError(f"Rank must lie in [0, {count}), got {rank}")
+    return state_from_index(rank, width)
+
+
+def rank_state(state: List[int]) -> int:
+    """Inverse of :func:`unrank_state`."""
+    return state_index(encode_state(state), board_width(len(state)))
+
+
+def random_state(rng: Optional[random.Random] = None, width: int = 3) -> List[int]:
+    """A solvable state drawn uniformly at random."""
+    return unrank_state((rng or random).randrange(solvable_count(width)), width)
+
+
+def walk_to_depth(depth: int, rng: Optional[random.Random] = None, width: int = 3,
+                  heuristic: str = 'manhattan', max_attempts: int = 10000) -> List[int]:
+    """A state exactly ``depth`` moves from the goal, found by random walks.
+
+    Each attempt walks ``depth`` moves back from the goal without revisiting
+    a state, then checks the end point's optimal solution length with
+    IDA*; walks that turn out to have a shortcut are discarded.  Unlike the
+    distance-table sampler this is not uniform within the depth class, but
+    it works on every board size.
+    """
+    rng = rng or random
+    board = get_board(width)
+    for _ in range(max_attempts):
+        state = list(board.goal)
+        blank_pos = board.size - 1
+        visited = {tuple(state)}
+        for _ in range(depth):
+            options = []
+            for _, new_pos in PuzzleSolver.get_possible_moves(blank_pos, width):
+                next_state = PuzzleSolver.get_next_state(state, blank_pos, new_pos)
+                if tuple(next_state) not in visited:
+                    options.append((next_state, new_pos))
+            if not options:
+                break
+            state, blank_pos = rng.choice(options)
+            visited.add(tuple(state))
+        else:
+            if len(PuzzleSolver.ida_star(state, heuristic)[0]) == depth:
+                return state
+    raise ValueError(f"No state at depth {depth} found in {max_attempts} random walks")
+
+
+def states_at_depth(depth: int, count: int, rng: Optional[random.Random] = None, width: int = 3,
+                    method: Optional[str] = None, replace: bool = False) -> List[List[int]]:
+    """``count`` states whose optimal solution takes exactly ``depth`` moves.
+
+    ``method`` is ``'table'`` (3x3 only: uniform over the depth class, via
+    the distance table) or ``'walk'`` (:func:`walk_to_depth`); by default
+    the table is used where it exists.  Table sampling is without
+    replacement unless ``replace`` is set, so it returns fewer than
+    ``count`` states when the depth class is smaller.
+    """
+    rng = rng or random
+    if method is None:
+        method = 'table' if width == 3 else 'walk'
+    if method == 'walk':
+        return [walk_to_depth(depth, rng, width) for _ in range(count)]
+    if method != 'table':
+        raise ValueError(f"Unknown sampling method {method!r}")
+    if width != 3:
+        raise ValueError("The distance table only covers the 3x3 board")
+
+    candidates = get_distance_table().states_at_depth(depth)
+    if not candidates:
+        raise ValueError(f"No 3x3 state lies {depth} moves from the goal")
+    if replace:
+        chosen = rng.choices(candidates, k=count)
+    else:
+        chosen = rng.sample(candidates, min(count, len(candidates)))
+    return [state_from_index(index) for index in chosen]
+
+
+def sample(count: int, seed: Optional[int] = None, width: int = 3, depth: Optional[int] = None,
+           method: Optional[str] = None):
+    """Seeded bulk API: a ``(count, width * width)`` uint8 NumPy array of
+    solvable states, uniform over all of them or, with ``depth``, drawn by
+    :func:`states_at_depth` (with replacement)."""
+    import numpy as np
+
+    size = width * width
+    if depth is not None:
+        states = states_at_depth(depth, count, random.Random(seed), width, method, replace=True)
+        return np.array(states, dtype=np.uint8).reshape(-1, size)
+
+    generator = np.random.default_rng(seed)
+    states = generator.permuted(np.tile(np.arange(size, dtype=np.uint8), (count, 1)), axis=1)
+    # Solvable iff permutation parity equals the parity of the blank's
+    # distance from its goal cell.  Parity is taken from the inversion count
+    # of the goal positions, in chunks to bound the (rows, n, n) temporary.
+    goal_pos = np.where(states == 0, size - 1, states.astype(np.int16) - 1)
+    parity = np.empty(count, dtype=np.int64)
+    upper = np.triu(np.ones((size, size), dtype=bool), 1)
+    for start in range(0, count, 4096):
+        block = goal_pos[start:start + 4096]
+        inversions = (block[:, :, None] > block[:, None, :]) & upper
+        parity[start:start + 4096] = inversions.sum(axis=(1, 2))
+    blank_pos = np.argmax(states == 0, axis=1)
+    blank_distance = (width - 1 - blank_pos // width) + (width - 1 - blank_pos % width)
+    unsolvable = np.nonzero((parity + blank_distance) % 2)[0]
+    # Swapping two tiles (not the blank) flips solvability, pairing every
+    # unsolvable arrangement with exactly one solvable one: still uniform.
+    rows = states[unsolvable]
+    first = np.where(rows[:, 0] == 0, 1, 0)
+    second = np.where((rows[:, 0] == 0) | (rows[:, 1] == 0), 2, 1)
+    index = np.arange(len(rows))
+    moved = rows[index, first]
+    rows[index, first] = rows[index, second]
+    rows[index, second] = moved
+    states[unsolvable] = rows
+    return states
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate solvable sliding-puzzle start states.")
+    parser.add_argument('-n', '--count', type=int, default=10, help="number of states")
+    parser.add_argument('-d', '--depth', type=int,
+                        help="exact optimal solution length (default: uniform over all states)")
+    parser.add_argument('--width', type=int, default=3, help="board width (default 3)")
+    parser.add_argument('--method', choices=('table', 'walk'),
+                        help="depth sampler (default: table on 3x3, walk otherwise)")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    try:
+        if args.depth is None:
+            states = [random_state(rng, args.width) for _ in range(args.count)]
+        else:
+            states = states_at_depth(args.depth, args.count, rng, args.width, args.method,
+                                     replace=True)
+    except ValueError as e:
+        parser.error(str(e))
+    for state in states:
+        print(','.join(map(str, state)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,46 @@
+import os
 import time
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QPushButton, QWidget, 
                              QGridLayout, QVBoxLayout, QHBoxLayout, QLabel, 
                              QComboBox, QFrame, QGraphicsDropShadowEffect, QLineEdit, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt5.QtGui import QFont, QColor
 import sys
-from puzzle_solver import PuzzleSolver
+from puzzle_solver import (DEFAULT_CACHE_DIR, PuzzleSolver, SearchCancelled, SearchStats,
+                           board_for, board_width)
 from complexity_analyzer import ComplexityAnalyzer
+from solution_cache import SolutionCache
+
+
+# Installed once on the board and shared by every tile.  A tile only flips
+# its ``blank`` property when it changes between blank and numbered, which
+# costs a re-polish instead of parsing a stylesheet per tile per frame.
+TILE_STYLE = """
+    QPushButton#glassTile {
+        color: white;
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                                  stop:0 rgba(106, 17, 203, 0.9), 
+                                  stop:1 rgba(37, 117, 252, 0.9));
+        border: 1px solid rgba(255, 255, 255, 0.3);
+        border-radius: 15px;
+    }
+    QPushButton#glassTile[blank="true"] {
+        background: rgba(255, 255, 255, 0.1);
+        border: 1px solid rgba(255, 255, 255, 0.2);
+    }
+"""
 
 
 class GlassTile(QPushButton):
-    def __init__(self, value):
+    def __init__(self, value, size=100):
         super().__init__()
         self.value = value
-        self.setFixedSize(100, 100)
-        self.setFont(QFont('Poppins', 28, QFont.Bold))
+        self.setFixedSize(size, size)
+        self.setFont(QFont('Poppins', max(12, size * 28 // 100), QFont.Bold))
         self.setCursor(Qt.PointingHandCursor)
         self.setObjectName('glassTile')
-        self.updateStyle()
+        self.setProperty('blank', value == 0)
+        self.setText(str(value) if value else "")
         
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(20)
@@ -25,34 +48,31 @@ class GlassTile(QPushButton):
         shadow.setOffset(-3, -3)
         self.setGraphicsEffect(shadow)
 
+    def setValue(self, value):
+        if value == self.value:
+            return
+        was_blank = self.value == 0
+        self.value = value
+        self.setText(str(value) if value else "")
+        if was_blank != (value == 0):
+            self.updateStyle()
+
     def updateStyle(self):
-        if self.value == 0:
-            self.setStyleSheet("""
-                QPushButton#glassTile {
-                    background-color: rgba(255, 255, 255, 0.1);
-                    border: 1px solid rgba(255, 255, 255, 0.2);
-                    border-radius: 15px;
-                }
-            """)
-            self.setText("")
-        else:
-            self.setText(str(self.value))
-            self.setStyleSheet("""
-                QPushButton#glassTile {
-                    color: white;
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                              stop:0 rgba(106, 17, 203, 0.9), 
-                                              stop:1 rgba(37, 117, 252, 0.9));
-                    border: 1px solid rgba(255, 255, 255, 0.3);
-                    border-radius: 15px;
-                }
-            """)
+        """Re-apply the shared tile style after the blank property changed."""
+        self.setProperty('blank', self.value == 0)
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
 
 
 class ModernBoard(QFrame):
-    def __init__(self):
+    BOARD_PIXELS = 300  # tiles shrink on larger boards to keep the window size
+
+    def __init__(self, grid_width=3):
         super().__init__()
+        self.grid_width = grid_width
         self.tiles = []
+        self.low_cost = False
         self.initUI()
         
     def initUI(self):
@@ -63,7 +83,7 @@ class ModernBoard(QFrame):
                 border-radius: 25px;
                 padding: 20px;
             }
-        """)
+        """ + TILE_STYLE)
         
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(30)
@@ -73,19 +93,46 @@ class ModernBoard(QFrame):
         
         layout = QGridLayout()
         layout.setSpacing(12)
-        
-        for i in range(3):
-            for j in range(3):
-                tile = GlassTile(0)
+        self.setLayout(layout)
+        self.buildTiles()
+
+    def buildTiles(self):
+        layout = self.layout()
+        for tile in self.tiles:
+            layout.removeWidget(tile)
+            tile.deleteLater()
+        self.tiles = []
+
+        tile_size = max(48, self.BOARD_PIXELS // self.grid_width)
+        for i in range(self.grid_width):
+            for j in range(self.grid_width):
+                tile = GlassTile(0, tile_size)
+                tile.graphicsEffect().setEnabled(not self.low_cost)
                 layout.addWidget(tile, i, j, Qt.AlignCenter)
                 self.tiles.append(tile)
-                
-        self.setLayout(layout)
-        
+
+    def setGridWidth(self, grid_width):
+        if grid_width != self.grid_width:
+            self.grid_width = grid_width
+            self.buildTiles()
+
+    def setLowCost(self, enabled):
+        """Switch the drop shadows off (or back on); re-rendering them is the
+        bulk of a frame's cost during fast playback."""
+        if enabled == self.low_cost:
+            return
+        self.low_cost = enabled
+        self.graphicsEffect().setEnabled(not enabled)
+        for tile in self.tiles:
+            tile.graphicsEffect().setEnabled(not enabled)
+
     def updateState(self, state):
+        if len(state) != len(self.tiles):
+            self.setGridWidth(board_width(len(state)))
+        # Only tiles whose value changed are touched: two per move.
         for tile, value in zip(self.tiles, state):
-            tile.value = value
-            tile.updateStyle()
+            if tile.value != value:
+                tile.setValue(value)
 
 
 class NeumorphicButton(QPushButton):
@@ -139,11 +186,73 @@ class NeumorphicButton(QPushButton):
         super().mouseReleaseEvent(event)
 
 
+class SolverWorker(QThread):
+    """Runs one search off the GUI thread.
+
+    The solver's progress callback is used both to publish live statistics
+    and as the cancellation point: once ``cancel`` is called the next
+    callback raises SearchCancelled inside the search.
+    """
+    progress = pyqtSignal(int, int, float)  # nodes explored, frontier size, nodes/sec
+    solved = pyqtSignal(object, float)  # solver result (or None), elapsed seconds
+    cancelled = pyqtSignal()
+
+    PROGRESS_PERIOD = 0.1  # seconds between progress signals
+
+    def __init__(self, solve_function, state):
+        super().__init__()
+        self.solve_function = solve_function
+        self.state = list(state)
+        self.stats = SearchStats()
+        self._cancel_requested = False
+        self._start_time = 0.0
+        self._last_report = 0.0
+
+    def cancel(self):
+        self._cancel_requested = True
+
+    def _report(self, nodes_explored, frontier_size):
+        if self._cancel_requested:
+            raise SearchCancelled()
+        now = time.perf_counter()
+        if now - self._last_report >= self.PROGRESS_PERIOD:
+            self._last_report = now
+            elapsed = now - self._start_time
+            rate = nodes_explored / elapsed if elapsed > 0 else 0.0
+            self.progress.emit(nodes_explored, frontier_size, rate)
+
+    def run(self):
+        self._start_time = self._last_report = time.perf_counter()
+        try:
+            result = self.solve_function(self.state, progress=self._report, stats=self.stats)
+        except SearchCancelled:
+            self.cancelled.emit()
+            return
+        self.stats.elapsed = time.perf_counter() - self._start_time
+        self.solved.emit(result, self.stats.elapsed)
+
+
 class ModernPuzzleGUI(QMainWindow):
+    STEP_INTERVAL = 500  # ms per move at 1x playback speed
+    FRAME_INTERVAL = 16  # ms; faster playback drops frames instead of ticking faster
+    PLAYBACK_SPEEDS = {"0.5x": 0.5, "1x": 1, "2x": 2, "5x": 5, "20x": 20, "100x": 100}
+    LOW_COST_SPEED = 20  # playback at this speed or faster renders without shadows
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("8-Puzzle Solver")
         self.analyzer = ComplexityAnalyzer()
+        self.cache = SolutionCache(path=os.path.join(DEFAULT_CACHE_DIR, 'solutions_v1.json'))
+        self.worker = None
+        self.race_reports = []  # per-strategy reports of the last portfolio solve
+        # Playback applies the solution's moves to one state list in place; a
+        # single repeating timer advances it to wherever the clock says it
+        # should be, so each tick costs the same whatever the path length.
+        self.playback_timer = QTimer(self)
+        self.playback_timer.timeout.connect(self.advancePlayback)
+        self.play_path = []
+        self.play_index = 0
+        self.play_finished = None
         self.initUI()
 
     def initUI(self):
@@ -183,14 +292,14 @@ class ModernPuzzleGUI(QMainWindow):
 
         state_input_frame = QFrame()
         state_input_layout = QVBoxLayout(state_input_frame)
-        state_input_label = QLabel("Enter Initial State (comma-separated, 0-8):")
+        state_input_label = QLabel("Enter Initial State (comma-separated, 0-8 for 3x3, 0-15 for 4x4, ...):")
         state_input_label.setFont(QFont('Poppins', 12))
         state_input_label.setStyleSheet("color: white;")
         self.state_input = QLineEdit()
         self.state_input.setFont(QFont('Poppins', 12))
         self.state_input.setPlaceholderText("e.g., 1,2,3,4,5,6,7,8,0")
         self.state_input.setStyleSheet("background: rgba(255, 255, 255, 0.1); color: white; padding: 5px;")
-        self.state_input.setToolTip("Enter initial state as comma-separated values (0-8, e.g., 1,2,3,4,5,6,7,8,0)")
+        self.state_input.setToolTip("Enter initial state as comma-separated values (0 to N*N-1, e.g., 1,2,3,4,5,6,7,8,0)")
         state_input_layout.addWidget(state_input_label)
         state_input_layout.addWidget(self.state_input)
         main_layout.addWidget(state_input_frame)
@@ -215,7 +324,8 @@ class ModernPuzzleGUI(QMainWindow):
 
         # ComboBox for selecting algorithm
         self.algo_combo = QComboBox()
-        self.algo_combo.addItems(["BFS", "DFS", "UCS"])
+        self.algo_combo.addItems(["BFS", "DFS", "IDDFS", "UCS", "Bidirectional BFS", "A*", "IDA*", "Distance Table",
+                                  "Portfolio"])
         self.algo_combo.setStyleSheet("""
             QComboBox {
                 font-size: 32px;
@@ -245,15 +355,37 @@ class ModernPuzzleGUI(QMainWindow):
         self.solve_button.setToolTip("Click to solve the puzzle using the selected algorithm")
         self.reset_button = NeumorphicButton("Reset", "#e74c3c")
         self.reset_button.setToolTip("Click to reset the puzzle to a random solvable state")
+        self.cancel_button = NeumorphicButton("Cancel", "#f39c12")
+        self.cancel_button.setToolTip("Click to stop the running search")
+        self.cancel_button.setEnabled(False)
 
         controls_layout.addWidget(algo_label)
         controls_layout.addWidget(self.algo_combo)
         controls_layout.addStretch()
         controls_layout.addWidget(self.solve_button)
         controls_layout.addWidget(self.reset_button)
+        controls_layout.addWidget(self.cancel_button)
 
         main_layout.addWidget(controls_frame)
 
+        playback_layout = QHBoxLayout()
+        speed_label = QLabel("Playback Speed:")
+        speed_label.setFont(QFont('Poppins', 12))
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItems(list(self.PLAYBACK_SPEEDS))
+        self.speed_combo.setCurrentText("1x")
+        self.speed_combo.setStyleSheet(self.algo_combo.styleSheet())
+        self.speed_combo.currentTextChanged.connect(self.restartPlaybackClock)
+        self.skip_button = NeumorphicButton("Skip to End", "#16a085")
+        self.skip_button.setToolTip("Click to jump to the end of the solution")
+        self.skip_button.setEnabled(False)
+        self.skip_button.clicked.connect(self.skipPlayback)
+        playback_layout.addWidget(speed_label)
+        playback_layout.addWidget(self.speed_combo)
+        playback_layout.addStretch()
+        playback_layout.addWidget(self.skip_button)
+        main_layout.addLayout(playback_layout)
+
         stats_layout = QVBoxLayout()
 
         # Time Complexity
@@ -290,18 +422,22 @@ class ModernPuzzleGUI(QMainWindow):
 
         self.solve_button.clicked.connect(self.solvePuzzle)
         self.reset_button.clicked.connect(self.resetPuzzle)
+        self.cancel_button.clicked.connect(self.cancelSolve)
         self.resetPuzzle()
 
     def validate_and_set_initial_state(self):
         try:
             input_state = list(map(int, self.state_input.text().split(',')))
-            # Check if input contains numbers from 0 to 8 (unordered)
-            if len(input_state) != 9 or set(input_state) != set(range(9)):
-                raise ValueError("State must contain numbers from 0 to 8 in any order.")
+            # The board size follows from the number of values: 9 -> 3x3, 16 -> 4x4, ...
+            size = len(input_state)
+            board_width(size)
+            if set(input_state) != set(range(size)):
+                raise ValueError(f"State must contain numbers from 0 to {size - 1} in any order.")
             if not PuzzleSolver.is_solvable(input_state):
                 raise ValueError("The state is not solvable.")
 
             self.state_input.setStyleSheet("background: rgba(255, 255, 255, 0.1); color: white;")  # Reset color
+            self.stopPlayback()
             self.current_state = input_state
             self.board.updateState(self.current_state)
             self.time_complexity.setText("N/A")
@@ -312,7 +448,8 @@ class ModernPuzzleGUI(QMainWindow):
             self.state_input.setStyleSheet("background: rgba(255, 0, 0, 0.3);")  # Change color on error
 
     def resetPuzzle(self):
-        self.current_state = PuzzleSolver.generate_solvable_state()
+        self.stopPlayback()
+        self.current_state = PuzzleSolver.generate_solvable_state(width=self.board.grid_width)
         self.board.updateState(self.current_state)
         self.time_complexity.setText("N/A")
         self.space_complexity.setText("N/A")
@@ -325,48 +462,170 @@ class ModernPuzzleGUI(QMainWindow):
         solve_function = {
             "BFS": PuzzleSolver.bfs,
             "DFS": PuzzleSolver.dfs,
-            "UCS": PuzzleSolver.ucs
+            "IDDFS": PuzzleSolver.iddfs,
+            "UCS": PuzzleSolver.ucs,
+            "Bidirectional BFS": PuzzleSolver.bidirectional_bfs,
+            "A*": PuzzleSolver.astar,
+            "IDA*": PuzzleSolver.ida_star,
+            "Distance Table": PuzzleSolver.solve_optimal,
+            "Portfolio": self.solvePortfolio
         }.get(algorithm)
 
         if not solve_function:
             QMessageBox.warning(self, "Algorithm Error", "Please select a valid algorithm.")
             self.solve_button.setEnabled(True)
             return
+        if solve_function is PuzzleSolver.solve_optimal and len(self.current_state) != 9:
+            QMessageBox.warning(self, "Algorithm Error", "The distance table only covers the 3x3 board.")
+            self.solve_button.setEnabled(True)
+            return
 
-        start_time = time.time()
-        result = solve_function(self.current_state)
-        elapsed_time = time.time() - start_time
+        self.algorithm = algorithm
+        self.reset_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.time_complexity.setText("Searching...")
+        self.time_complexity.setToolTip("")
+        self.space_complexity.setText("N/A")
+        self.elapsed_time.setText("N/A")
+        self.race_reports = []
+
+        self.worker = SolverWorker(self.cache.cached(solve_function, algorithm), self.current_state)
+        self.worker.progress.connect(self.updateProgress)
+        self.worker.solved.connect(self.onSolved)
+        self.worker.cancelled.connect(self.onCancelled)
+        self.worker.start()
+
+    def solvePortfolio(self, state, **kwargs):
+        """Race A*, bidirectional BFS and IDA* in separate processes (runs
+        on the worker thread)."""
+        import portfolio  # multiprocessing and friends, only needed for this mode
+        return portfolio.solve(state, reports=self.race_reports, **kwargs)
+
+    def closeEvent(self, event):
+        self.playback_timer.stop()
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        try:
+            self.cache.save()
+        except OSError:
+            pass  # losing the cache only costs searches next time
+        super().closeEvent(event)
+
+    def cancelSolve(self):
+        if self.worker is not None:
+            self.cancel_button.setEnabled(False)
+            self.worker.cancel()
+
+    def updateProgress(self, nodes_explored, frontier_size, nodes_per_second):
+        self.time_complexity.setText(f"Searching... {nodes_explored:,} nodes explored")
+        self.space_complexity.setText(f"Frontier: {frontier_size:,} nodes")
+        self.elapsed_time.setText(f"{nodes_per_second:,.0f} nodes/sec")
+
+    def onCancelled(self):
+        self.worker.wait()  # run() returns right after emitting
+        self.worker = None
+        self.cancel_button.setEnabled(False)
+        self.reset_button.setEnabled(True)
+        self.solve_button.setEnabled(True)
+        self.time_complexity.setText("Search cancelled")
+        self.space_complexity.setText("N/A")
+        self.elapsed_time.setText("N/A")
+
+    def onSolved(self, result, elapsed_time):
+        self.worker.wait()  # run() returns right after emitting
+        stats = self.worker.stats
+        self.worker = None
+        self.cancel_button.setEnabled(False)
+        self.reset_button.setEnabled(True)
+        algorithm = self.algorithm
 
         if result:
             path, states, nodes_explored = result
-            complexity = self.analyzer.analyze(algorithm, nodes_explored, len(path))
-            self.animateSolution(states)
-            QTimer.singleShot(500 * len(states), lambda: self.updateComplexity(complexity, elapsed_time))  # Wait for the animation to complete
+            complexity = self.analyzer.analyze(algorithm, nodes_explored, len(path), stats)
+            if algorithm == "Portfolio" and self.race_reports:
+                winner = next(report['strategy'] for report in self.race_reports
+                              if report['status'] == 'won')
+                complexity['time'] += f" - won by {winner}"
+                self.time_complexity.setToolTip("\n".join(
+                    f"{report['strategy']}: {report['status']}, "
+                    f"{report['nodes_explored']:,} nodes" for report in self.race_reports))
+            self.time_complexity.setText(f"Animating {len(path)} moves...")
+            self.space_complexity.setText("N/A")
+            self.elapsed_time.setText("N/A")
+            self.startPlayback(states[0], path,
+                               lambda: self.updateComplexity(complexity, elapsed_time))
         else:
             self.time_complexity.setText("No solution found!")
             self.space_complexity.setText("N/A")
             self.elapsed_time.setText("N/A")
             self.solve_button.setEnabled(True)
 
-    def animateSolution(self, states):
-        if states:
-            self.board.updateState(states.pop(0))
-            QTimer.singleShot(500, lambda: self.animateSolution(states))
-        else:
+    def startPlayback(self, initial_state, path, on_finished):
+        self.playback_timer.stop()
+        self.play_state = list(initial_state)
+        self.play_blank = self.play_state.index(0)
+        self.play_moves = board_for(self.play_state).moves
+        self.play_path = path
+        self.play_index = 0
+        self.play_finished = on_finished
+        self.board.updateState(self.play_state)
+        self.skip_button.setEnabled(True)
+        self.restartPlaybackClock()
+        self.playback_timer.start()
+
+    def playbackStep(self):
+        """Seconds per move at the selected speed."""
+        return self.STEP_INTERVAL / 1000 / self.PLAYBACK_SPEEDS[self.speed_combo.currentText()]
+
+    def restartPlaybackClock(self):
+        step = self.playbackStep()
+        self.play_origin = time.perf_counter() - self.play_index * step
+        self.playback_timer.setInterval(max(self.FRAME_INTERVAL, int(step * 1000)))
+        if self.play_finished is not None:
+            speed = self.PLAYBACK_SPEEDS[self.speed_combo.currentText()]
+            self.board.setLowCost(speed >= self.LOW_COST_SPEED)
+
+    def advancePlayback(self):
+        due = int((time.perf_counter() - self.play_origin) / self.playbackStep())
+        self.seekPlayback(min(due, len(self.play_path)))
+
+    def seekPlayback(self, index):
+        """Apply moves up to ``index`` and draw only the resulting state;
+        frames in between are dropped."""
+        state, blank_pos, moves, path = self.play_state, self.play_blank, self.play_moves, self.play_path
+        for i in range(self.play_index, index):
+            new_pos = blank_pos + moves[path[i]]
+            state[blank_pos], state[new_pos] = state[new_pos], 0
+            blank_pos = new_pos
+        self.play_blank, self.play_index = blank_pos, index
+        self.board.updateState(state)
+        if index == len(path):
+            finished = self.play_finished
+            self.stopPlayback()
+            finished()
+
+    def skipPlayback(self):
+        if self.playback_timer.isActive():
+            self.seekPlayback(len(self.play_path))
+
+    def stopPlayback(self):
+        self.playback_timer.stop()
+        self.play_finished = None
+        self.board.setLowCost(False)
+        self.skip_button.setEnabled(False)
+        if self.worker is None:
             self.solve_button.setEnabled(True)
 
     def updateComplexity(self, complexity, elapsed_time):
         """Update complexity values after animation."""
         self.time_complexity.setText(complexity['time'])
         self.space_complexity.setText(complexity['space'])
-        self.elapsed_time.setText(f"{elapsed_time*100:.2f} seconds")
-
-    def animateSolution(self, states):
-        if states:
-            self.board.updateState(states.pop(0))
-            QTimer.singleShot(500, lambda: self.animateSolution(states))
+        if 'expansion_time' in complexity:
+            self.elapsed_time.setText(f"{elapsed_time:.3f} seconds "
+                                      f"({complexity['expansion_time']:.3f} s expanding)")
         else:
-            self.solve_button.setEnabled(True)
+            self.elapsed_time.setText(f"{elapsed_time:.3f} seconds")
 
 
 if __name__ == "__main__":
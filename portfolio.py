@@ -0,0 +1,299 @@
+"""Portfolio solving: race several strategies on one state, each in its own
+process, and keep the first acceptable answer.
+
+Which search is cheapest depends on the instance (bidirectional BFS wins
+short solutions, IDA* deep ones, A* the middle), so rather than guessing,
+:func:`race` starts them all, takes the first answer and stops the rest.
+Every strategy reports its own statistics, which makes it easy to see who
+wins where::
+
+    python instance_generator.py --count 200 --seed 1 > states.txt
+    python portfolio.py states.txt -s astar,bidirectional,ida_star -o races.jsonl
+
+prints, per optimal-solution-length band, how often each strategy won.
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from batch_solve import ALGORITHMS, parse_state, read_states
+from puzzle_solver import (BudgetExhausted, ProgressCallback, PuzzleSolver, Replay,
+                           SearchBudget, SearchCancelled, SearchStats)
+
+
+DEFAULT_STRATEGIES = ('astar', 'bidirectional', 'ida_star')
+# Strategies send progress at most every REPORT_PERIOD seconds.  Once the
+# race is decided the others get GRACE_PERIOD seconds to stop at their next
+# progress check and send their statistics before they are terminated.
+REPORT_PERIOD = 0.1
+GRACE_PERIOD = 0.5
+# Strategies are spawned rather than forked: the GUI races from a worker
+# thread, and forking a multi-threaded process can deadlock the child.
+_CONTEXT = multiprocessing.get_context('spawn')
+
+Result = Tuple[List[str], Replay, int]
+
+
+def _run_strategy(strategy: str, state: List[int], budget: Optional[SearchBudget],
+                  events, stop) -> None:
+    """Child process: run one strategy and send ``(strategy, kind, data)``
+    events, ``'progress'`` ones while searching and a single ``'done'``."""
+    last_report = 0.0
+
+    def report(nodes_explored: int, frontier_size: int) -> None:
+        nonlocal last_report
+        if stop.is_set():
+            raise SearchCancelled()
+        now = time.perf_counter()
+        if now - last_report >= REPORT_PERIOD:
+            last_report = now
+            events.put((strategy, 'progress', (nodes_explored, frontier_size)))
+
+    stats = SearchStats()
+    path = closest = None
+    nodes_explored = 0
+    start_time = time.perf_counter()
+    try:
+        result = ALGORITHMS[strategy](state, progress=report, stats=stats, budget=budget)
+    except BudgetExhausted as e:
+        status, nodes_explored, closest = e.reason, e.nodes_explored, e.closest
+    except SearchCancelled:
+        status = 'cancelled'
+    except Exception as e:
+        status = f"error: {e!r}"
+    else:
+        if result is None:
+            status = 'no_solution'
+        else:
+            status = 'solved'
+            path, _, nodes_explored = result
+    stats.elapsed = time.perf_counter() - start_time
+    events.put((strategy, 'done', {
+        'status': status,
+        'path': path,
+        'nodes_explored': nodes_explored or stats.expanded,
+        'closest': closest,
+        'stats': stats.as_dict(),
+    }))
+
+
+def race(initial_state: List[int], strategies: Sequence[str] = DEFAULT_STRATEGIES,
+         accept: Optional[Callable[[List[str]], bool]] = None,
+         progress: Optional[ProgressCallback] = None, budget: Optional[SearchBudget] = None
+         ) -> Tuple[Optional[Result], List[dict]]:
+    """Run ``strategies`` (names from ``batch_solve.ALGORITHMS``) in parallel
+    on ``initial_state``.
+
+    The first solution that ``accept(path)`` approves (any solution by
+    default) wins and the other strategies are stopped.  If none is
+    accepted, the shortest solution found is returned once every strategy
+    has finished.  ``progress`` receives the summed node and frontier counts
+    of all strategies; raising SearchCancelled from it stops the race.  Each
+    strategy runs under its own copy of ``budget``; if all of them run out,
+    BudgetExhausted is raised with the best partial result among them.
+    Strategies run in spawned processes, so a script that calls this needs
+    the usual ``if __name__ == '__main__'`` guard.
+
+    Returns ``(result or None, reports)`` with one report per strategy:
+    its ``status`` (``'won'``, ``'solved'``, ``'no_solution'``,
+    ``'cancelled'``, ``'killed'``, ``'crashed: exit N'``, a budget reason
+    or an error), nodes explored, solution length, wall time and
+    :class:`SearchStats` as a dict (None for killed and crashed strategies).
+    """
+    unknown = [strategy for strategy in strategies if strategy not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {', '.join(unknown)}")
+    strategies = list(dict.fromkeys(strategies))
+    events = _CONTEXT.Queue()
+    stop = _CONTEXT.Event()
+    processes = {
+        strategy: _CONTEXT.Process(
+            target=_run_strategy, args=(strategy, list(initial_state), budget, events, stop),
+            daemon=True)
+        for strategy in strategies
+    }
+    reports = {
+        strategy: {'strategy': strategy, 'status': 'killed', 'nodes_explored': 0,
+                   'path_length': None, 'wall_time': None, 'stats': None}
+        for strategy in strategies
+    }
+    frontiers = dict.fromkeys(strategies, 0)
+    running = set(strategies)
+    winner = best = None
+    closest = []
+
+    def handle(strategy: str, kind: str, data) -> None:
+        nonlocal winner, best
+        report = reports[strategy]
+        if kind == 'progress':
+            report['nodes_explored'], frontiers[strategy] = data
+            return
+        running.discard(strategy)
+        frontiers[strategy] = 0
+        path = data['path']
+        report.update(status=data['status'], nodes_explored=data['nodes_explored'],
+                      path_length=None if path is None else len(path),
+                      wall_time=time.perf_counter() - start_time, stats=data['stats'])
+        if data['closest'] is not None:
+            closest.append((data['closest'], data['status'], data['nodes_explored']))
+        if path is None or winner is not None:
+            return
+        if accept is None or accept(path):
+            winner = strategy
+            report['status'] = 'won'
+            best = (path, data['nodes_explored'])
+        elif best is None or len(path) < len(best[0]):
+            best = (path, data['nodes_explored'])
+
+    def reap() -> None:
+        # Strategies whose process died without a 'done' event (killed by
+        # the OOM killer, say) would otherwise be waited for forever.
+        dead = [strategy for strategy in running if processes[strategy].exitcode is not None]
+        if not dead:
+            return
+        # A process that exited normally flushed its events before exiting.
+        while True:
+            try:
+                handle(*events.get_nowait())
+            except queue.Empty:
+                break
+        for strategy in dead:
+            if strategy in running:
+                running.discard(strategy)
+                frontiers[strategy] = 0
+                reports[strategy].update(status=f"crashed: exit {processes[strategy].exitcode}",
+                                         wall_time=time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    for process in processes.values():
+        process.start()
+    try:
+        while running and winner is None:
+            try:
+                handle(*events.get(timeout=REPORT_PERIOD))
+            except queue.Empty:
+                reap()
+            if progress is not None:
+                progress(sum(report['nodes_explored'] for report in reports.values()),
+                         sum(frontiers.values()))
+    finally:
+        stop.set()
+        grace_end = time.perf_counter() + GRACE_PERIOD
+        while running:
+            remaining = grace_end - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                handle(*events.get(timeout=min(remaining, REPORT_PERIOD)))
+            except queue.Empty:
+                reap()
+        for strategy, process in processes.items():
+            if strategy in running:
+                process.terminate()
+                reports[strategy]['wall_time'] = time.perf_counter() - start_time
+            process.join()
+        events.close()
+
+    if best is None:
+        statuses = {report['status'] for report in reports.values()}
+        if closest and statuses <= {'max_nodes', 'max_memory', 'deadline'}:
+            partial, reason, nodes_explored = min(closest, key=lambda item: item[0][2])
+            raise BudgetExhausted(reason, nodes_explored, partial)
+        return None, list(reports.values())
+    path, nodes_explored = best
+    return (path, PuzzleSolver.replay(initial_state, path), nodes_explored), list(reports.values())
+
+
+def solve(initial_state: List[int], strategies: Sequence[str] = DEFAULT_STRATEGIES,
+          progress: Optional[ProgressCallback] = None, stats: Optional[SearchStats] = None,
+          budget: Optional[SearchBudget] = None, reports: Optional[list] = None
+          ) -> Optional[Result]:
+    """:func:`race` with the solver calling convention, so a portfolio can
+    stand in wherever a single search is expected.  ``stats`` receives the
+    winner's statistics and ``reports``, if given, is extended with the
+    per-strategy reports."""
+    result, race_reports = race(initial_state, strategies, progress=progress, budget=budget)
+    if reports is not None:
+        reports.extend(race_reports)
+    if stats is not None:
+        for report in race_reports:
+            if report['status'] == 'won':
+                for name, value in report['stats'].items():
+                    if name in SearchStats.__slots__:
+                        setattr(stats, name, value)
+    return result
+
+
+def win_table(records: List[dict], band_width: int = 5) -> Dict[str, Dict[str, int]]:
+    """Wins per strategy for each band of optimal solution lengths
+    (``'0-4'``, ``'5-9'``, ...), from records written by :func:`main`."""
+    table: Dict[str, Dict[str, int]] = {}
+    for record in records:
+        if record.get('winner') is None:
+            continue
+        low = record['path_length'] // band_width * band_width
+        band = table.setdefault(f"{low}-{low + band_width - 1}", {})
+        band[record['winner']] = band.get(record['winner'], 0) + 1
+    return dict(sorted(table.items(), key=lambda item: int(item[0].split('-')[0])))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Race solving strategies on each start state.")
+    parser.add_argument('input', help="file with one comma-separated state per line, or - for stdin")
+    parser.add_argument('-s', '--strategies', default=','.join(DEFAULT_STRATEGIES),
+                        help="comma-separated subset of: " + ', '.join(ALGORITHMS))
+    parser.add_argument('-o', '--output', default='-', help="JSON Lines output file (default: stdout)")
+    parser.add_argument('--time-limit', type=float, help="seconds each strategy may run per state")
+    parser.add_argument('--band-width', type=int, default=5,
+                        help="solution lengths per band in the win table (default 5)")
+    args = parser.parse_args(argv)
+    strategies = [name for name in args.strategies.split(',') if name]
+    unknown = [name for name in strategies if name not in ALGORITHMS]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)}")
+    budget = None if args.time_limit is None else SearchBudget(time_limit=args.time_limit)
+
+    infile = sys.stdin if args.input == '-' else open(args.input)
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w')
+    records = []
+    try:
+        for line_number, text in read_states(infile):
+            record = {'line': line_number}
+            try:
+                state = parse_state(text)
+            except ValueError as e:
+                record.update(state=text, error=str(e))
+            else:
+                start_time = time.perf_counter()
+                try:
+                    result, reports = race(state, strategies, budget=budget)
+                except BudgetExhausted as e:
+                    result, reports = None, []
+                    record['error'] = str(e)
+                winner = next((report['strategy'] for report in reports
+                               if report['status'] == 'won'), None)
+                record.update(state=state, winner=winner,
+                              path_length=None if result is None else len(result[0]),
+                              wall_time=time.perf_counter() - start_time, strategies=reports)
+                records.append(record)
+            outfile.write(json.dumps(record) + '\n')
+            outfile.flush()
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    for band, wins in win_table(records, args.band_width).items():
+        summary = ', '.join(f"{strategy} {count}" for strategy, count
+                            in sorted(wins.items(), key=lambda item: -item[1]))
+        print(f"{band:>7} moves: {summary}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Sliding-puzzle search, with no GUI dependency.
+
+The searches themselves live in :mod:`puzzle_solver.search` and their
+public names (``__all__``) are re-exported here.  The heavier optional
+engines (the 3x3 distance table, pattern databases, the NumPy breadth-first
+search and the disk-backed frontier search) are submodules that are only
+imported on first use, whether through a solver that needs them or through
+an attribute of this package such as ``puzzle_solver.get_distance_table``.
+"""
+import importlib
+
+from .search import (
+    ANYTIME_WEIGHT, DEFAULT_CACHE_DIR, IDDFS_MAX_DEPTH, IDDFS_TABLE_SIZE, MOVE_NAMES,
+    PROGRESS_INTERVAL, Board, BudgetExhausted, Closest, Heuristic, LinearConflict,
+    ManhattanDistance, MisplacedTiles, ProgressCallback, PuzzleNode, PuzzleSolver, Replay,
+    SearchBudget, SearchCancelled, SearchOutcome, SearchStats, board_for, board_width,
+    decode_state, encode_state, get_board, profile_search, register_heuristic, resident_memory,
+    tile_bits,
+)
+
+# The lazily loaded names below are left out so that ``import *`` stays cheap.
+__all__ = [
+    'ANYTIME_WEIGHT', 'DEFAULT_CACHE_DIR', 'IDDFS_MAX_DEPTH', 'IDDFS_TABLE_SIZE', 'MOVE_NAMES',
+    'PROGRESS_INTERVAL', 'Board', 'BudgetExhausted', 'Closest', 'Heuristic', 'LinearConflict',
+    'ManhattanDistance', 'MisplacedTiles', 'ProgressCallback', 'PuzzleNode', 'PuzzleSolver',
+    'Replay', 'SearchBudget', 'SearchCancelled', 'SearchOutcome', 'SearchStats', 'board_for',
+    'board_width', 'decode_state', 'encode_state', 'get_board', 'profile_search',
+    'register_heuristic', 'resident_memory', 'tile_bits',
+]
+
+_SUBMODULES = ('distance_table', 'frontier_search', 'numpy_bfs', 'pattern_database')
+# Names served from a submodule, which is imported when one is first asked for.
+_LAZY_NAMES = {
+    'DistanceTable': 'distance_table',
+    'get_distance_table': 'distance_table',
+    'AdditivePatternDatabase': 'pattern_database',
+    'PatternDatabase': 'pattern_database',
+    'get_database': 'pattern_database',
+    'frontier_bfs': 'frontier_search',
+    'distances': 'numpy_bfs',
+    'sweep': 'numpy_bfs',
+}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _LAZY_NAMES:
+        module = importlib.import_module(f'{__name__}.{_LAZY_NAMES[name]}')
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_LAZY_NAMES))
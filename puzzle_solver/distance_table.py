@@ -0,0 +1,187 @@
+import mmap
+import os
+import struct
+from collections import deque
+from math import factorial
+from typing import Dict, List, Optional
+
+from .search import (DEFAULT_CACHE_DIR, TILE_MASK, _TRANSITIONS, PuzzleSolver, encode_state,
+                     tile_bits)
+
+
+# Exact solution length of every reachable 3x3 state, one byte per state.
+#
+# States are indexed by ``blank * 8!/2 + rank(tiles) // 2`` where ``rank`` is
+# the lexicographic rank of the eight tiles read in board order (blank
+# skipped).  Lexicographic ranks 2k and 2k + 1 differ only by a swap of the
+# last two tiles, so exactly one of them has the inversion parity that makes
+# the board solvable with the blank at that cell; halving the rank drops the
+# unreachable half.  The same numbering works on any width, which is how
+# ``instance_generator`` draws uniform random states on larger boards.
+SIZE = 9
+TILES = SIZE - 1
+HALF_TILE_PERMUTATIONS = factorial(TILES) // 2
+STATE_COUNT = SIZE * HALF_TILE_PERMUTATIONS  # 181,440
+UNREACHED = 0xFF
+
+FILE_MAGIC = b'PZDT'
+FILE_VERSION = 1
+_HEADER = struct.Struct('<4sHHI')  # magic, version, board width, state count
+
+_FACTORIALS = [factorial(i) for i in range(TILES)][::-1]
+
+DEFAULT_PATH = os.path.join(DEFAULT_CACHE_DIR, f'distance_v{FILE_VERSION}.bin')
+
+
+def _rank_weights(size: int) -> List[int]:
+    if size == SIZE:
+        return _FACTORIALS
+    return [factorial(i) for i in range(size - 1)][::-1]
+
+
+def _wanted_parity(blank_pos: int, width: int) -> int:
+    # Tile-inversion parity of solvable states with the blank at blank_pos
+    # (see PuzzleSolver.is_solvable).
+    if width % 2:
+        return 0
+    return (width - blank_pos // width + 1) % 2
+
+
+def state_index(code: int, width: int = 3) -> int:
+    """Number of the solvable state ``code`` on a ``width`` x ``width``
+    board, in ``0 .. (n!/2 - 1)`` for ``n`` cells."""
+    size = width * width
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    weights = _rank_weights(size)
+    tiles = []
+    blank_pos = 0
+    for pos in range(size):
+        tile = (code >> (bits * pos)) & mask
+        if tile:
+            tiles.append(tile)
+        else:
+            blank_pos = pos
+    rank = 0
+    for i, tile in enumerate(tiles):
+        smaller = 0
+        for later in tiles[i + 1:]:
+            if later < tile:
+                smaller += 1
+        rank += smaller * weights[i]
+    return blank_pos * (weights[0] * (size - 1) // 2) + rank // 2
+
+
+def state_from_index(index: int, width: int = 3) -> List[int]:
+    """Inverse of :func:`state_index`, as a list of tiles."""
+    size = width * width
+    weights = _rank_weights(size)
+    blank_pos, half_rank = divmod(index, weights[0] * (size - 1) // 2)
+    rank = 2 * half_rank
+    remaining = list(range(1, size))
+    tiles = []
+    inversions = 0
+    for weight in weights:
+        digit, rank = divmod(rank, weight)
+        inversions += digit
+        tiles.append(remaining.pop(digit))
+    if inversions % 2 != _wanted_parity(blank_pos, width):
+        tiles[-1], tiles[-2] = tiles[-2], tiles[-1]
+    tiles.insert(blank_pos, 0)
+    return tiles
+
+
+class DistanceTable:
+    """Optimal move counts for all 9!/2 solvable states, indexed by
+    :func:`state_index`.  ``data`` is either a ``bytearray`` (freshly built)
+    or a read-only view of a memory-mapped cache file."""
+
+    def __init__(self, data):
+        if len(data) != STATE_COUNT:
+            raise ValueError(f"Expected {STATE_COUNT} entries, got {len(data)}")
+        self.data = data
+
+    def __getitem__(self, code: int) -> int:
+        return self.data[state_index(code)]
+
+    def distance(self, state: List[int]) -> int:
+        return self.data[state_index(encode_state(state))]
+
+    def states_at_depth(self, depth: int) -> List[int]:
+        """Indices (see :func:`state_from_index`) of every state exactly
+        ``depth`` moves from the goal."""
+        data = bytes(self.data)
+        marker = bytes([depth])
+        indices = []
+        index = data.find(marker)
+        while index >= 0:
+            indices.append(index)
+            index = data.find(marker, index + 1)
+        return indices
+
+    @classmethod
+    def build(cls) -> 'DistanceTable':
+        """Breadth-first search backwards from the goal over the whole space."""
+        goal = PuzzleSolver.GOAL_CODE
+        depth: Dict[int, int] = {goal: 0}
+        queue = deque([(goal, PuzzleSolver.GOAL_STATE.index(0))])
+        while queue:
+            code, blank_pos = queue.popleft()
+            next_depth = depth[code] + 1
+            for _, new_pos, shift_new, shift_blank in _TRANSITIONS[blank_pos]:
+                tile = (code >> shift_new) & TILE_MASK
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                if new_code not in depth:
+                    depth[new_code] = next_depth
+                    queue.append((new_code, new_pos))
+
+        data = bytearray([UNREACHED]) * STATE_COUNT
+        for code, moves in depth.items():
+            data[state_index(code)] = moves
+        return cls(data)
+
+    def save(self, path: str = DEFAULT_PATH) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(FILE_MAGIC, FILE_VERSION, 3, STATE_COUNT))
+            f.write(self.data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> Optional['DistanceTable']:
+        """Memory-map a cache file, or return None if it is missing or stale."""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(_HEADER.size)
+                if len(header) != _HEADER.size:
+                    return None
+                if _HEADER.unpack(header) != (FILE_MAGIC, FILE_VERSION, 3, STATE_COUNT):
+                    return None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mapped) != _HEADER.size + STATE_COUNT:
+            mapped.close()
+            return None
+        return cls(memoryview(mapped)[_HEADER.size:])
+
+
+_table: Optional[DistanceTable] = None
+
+
+def get_distance_table(path: str = DEFAULT_PATH) -> DistanceTable:
+    """Return the shared table, loading it from ``path`` or building (and
+    caching) it on first use."""
+    global _table
+    if _table is None:
+        table = DistanceTable.load(path)
+        if table is None:
+            table = DistanceTable.build()
+            try:
+                table.save(path)
+            except OSError:
+                pass  # a read-only cache directory only costs a rebuild next run
+        _table = table
+    return _table
+
@@ -0,0 +1,330 @@
+"""Memory-bounded breadth-first enumeration of a whole state space::
+
+    python -m puzzle_solver.frontier_search --width 4 --max-depth 30 --spill-dir /scratch
+
+prints the number of states at each distance from the goal and some of
+the hardest states found.
+"""
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .numpy_bfs import decode
+from .search import MOVE_NAMES, ProgressCallback, PuzzleSolver, board_for, decode_state, encode_state
+
+
+# Breadth-first frontier search, for enumerating spaces that do not fit in
+# memory.
+#
+# No closed list is kept.  Every frontier record is a state code plus one
+# "used operator" bit per move direction, set for each move that leads back
+# to a parent in the previous layer.  Expanding a record skips those moves.
+# The puzzle graph is bipartite (every move flips the blank's colour on a
+# chessboard), so no edge joins two states of the same layer.  The only
+# neighbours a state can have outside the next layer are therefore its
+# parents, and none of them is regenerated.  Only the layer being expanded
+# and the one being built are kept, and both live on disk.
+#
+# Children are collected in memory up to ``chunk_records``, then sorted,
+# deduplicated (duplicates OR their operator bits together) and spilled as
+# a chunk file.  When the layer is done, an external k-way merge of its
+# chunks produces the next layer as one sorted, duplicate-free file.
+#
+# Chunk and layer files are sequences of blocks of at most BLOCK_RECORDS
+# records.  Each block is a header (record count, payload length) and a
+# zlib payload holding the delta-encoded codes, byte-plane shuffled, then
+# the operator bytes.  Sorted codes differ by little, so most delta bytes
+# are zero and compress well.  Files are read through mmap, one block at a
+# time.
+BLOCK_RECORDS = 1 << 16
+CHUNK_RECORDS = 1 << 22
+COMPRESSION_LEVEL = 1
+_BLOCK_HEADER = struct.Struct('<II')
+
+
+class FrontierCensus:
+    """Result of :func:`frontier_bfs`.
+
+    ``depth_counts[d]`` is the number of states at distance ``d`` from the
+    start, and ``hardest`` holds up to ``keep_hardest`` states of the
+    deepest layer reached.  ``complete`` is False when ``max_depth`` stopped
+    the search before the space was exhausted; the last layer is then not
+    necessarily the deepest one.
+    """
+
+    def __init__(self, width: int, depth_counts: List[int], hardest: List[List[int]],
+                 complete: bool, nodes_explored: int, bytes_spilled: int, peak_records: int):
+        self.width = width
+        self.depth_counts = depth_counts
+        self.hardest = hardest
+        self.complete = complete
+        self.nodes_explored = nodes_explored
+        self.bytes_spilled = bytes_spilled  # compressed bytes written to chunk and layer files
+        self.peak_records = peak_records  # most child records buffered in memory at once
+
+    @property
+    def radius(self) -> int:
+        """Depth of the deepest layer reached."""
+        return len(self.depth_counts) - 1
+
+    @property
+    def states(self) -> int:
+        return sum(self.depth_counts)
+
+
+def _deduplicate(codes: np.ndarray, ops: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort records by code and merge equal codes, ORing their operator bits."""
+    order = np.argsort(codes, kind='stable')
+    codes, ops = codes[order], ops[order]
+    if len(codes) == 0:
+        return codes, ops
+    starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+    return codes[starts], np.bitwise_or.reduceat(ops, starts)
+
+
+class _ChunkWriter:
+    """Appends sorted records to a block file (see the module comment)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.records = 0
+        self.bytes_written = 0
+        self._codes: List[np.ndarray] = []
+        self._ops: List[np.ndarray] = []
+        self._buffered = 0
+
+    def write(self, codes: np.ndarray, ops: np.ndarray) -> None:
+        self._codes.append(codes)
+        self._ops.append(ops)
+        self._buffered += len(codes)
+        if self._buffered >= BLOCK_RECORDS:
+            self._flush(final=False)
+
+    def close(self) -> None:
+        self._flush(final=True)
+        self.file.close()
+
+    def _flush(self, final: bool) -> None:
+        if not self._buffered:
+            return
+        codes, ops = np.concatenate(self._codes), np.concatenate(self._ops)
+        end = len(codes) if final else len(codes) - len(codes) % BLOCK_RECORDS
+        for start in range(0, end, BLOCK_RECORDS):
+            self._write_block(codes[start:min(start + BLOCK_RECORDS, end)],
+                              ops[start:min(start + BLOCK_RECORDS, end)])
+        self._codes, self._ops = [codes[end:]], [ops[end:]]
+        self._buffered = len(codes) - end
+
+    def _write_block(self, codes: np.ndarray, ops: np.ndarray) -> None:
+        deltas = np.diff(codes, prepend=np.uint64(0))
+        planes = deltas.view(np.uint8).reshape(-1, 8).T
+        payload = zlib.compress(planes.tobytes() + ops.tobytes(), COMPRESSION_LEVEL)
+        self.file.write(_BLOCK_HEADER.pack(len(codes), len(payload)))
+        self.file.write(payload)
+        self.records += len(codes)
+        self.bytes_written += _BLOCK_HEADER.size + len(payload)
+
+
+def _read_blocks(path: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield the ``(codes, ops)`` blocks of a file written by _ChunkWriter."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            offset = 0
+            try:
+                while offset < len(data):
+                    count, length = _BLOCK_HEADER.unpack_from(data, offset)
+                    offset += _BLOCK_HEADER.size
+                    raw = zlib.decompress(view[offset:offset + length])
+                    offset += length
+                    planes = np.frombuffer(raw, dtype=np.uint8, count=8 * count).reshape(8, count)
+                    codes = np.cumsum(np.ascontiguousarray(planes.T).view(np.uint64).ravel(),
+                                      dtype=np.uint64)
+                    yield codes, np.frombuffer(raw, dtype=np.uint8, offset=8 * count)
+            finally:
+                view.release()
+
+
+def _merge(paths: List[str], writer: _ChunkWriter) -> None:
+    """External k-way merge of sorted, individually duplicate-free files.
+
+    Each round emits every buffered record up to the smallest of the
+    buffers' last codes.  No record still unread in any file can be that
+    small, so equal codes from different files always meet in one round.
+    """
+    readers = [_read_blocks(path) for path in paths]
+    buffers = [next(reader, None) for reader in readers]
+    while True:
+        live = [i for i, buffer in enumerate(buffers) if buffer is not None]
+        if not live:
+            break
+        bound = min(buffers[i][0][-1] for i in live)
+        code_parts, op_parts = [], []
+        for i in live:
+            codes, ops = buffers[i]
+            cut = int(np.searchsorted(codes, bound, side='right'))
+            code_parts.append(codes[:cut])
+            op_parts.append(ops[:cut])
+            buffers[i] = next(readers[i], None) if cut == len(codes) else (codes[cut:], ops[cut:])
+        if len(code_parts) == 1:
+            writer.write(code_parts[0], op_parts[0])
+        else:
+            writer.write(*_deduplicate(np.concatenate(code_parts), np.concatenate(op_parts)))
+
+
+def frontier_bfs(initial_state: Optional[List[int]] = None, width: int = 3,
+                 max_depth: Optional[int] = None, keep_hardest: int = 10,
+                 chunk_records: int = CHUNK_RECORDS, spill_dir: Optional[str] = None,
+                 progress: Optional[ProgressCallback] = None) -> FrontierCensus:
+    """Count the states at every distance from ``initial_state`` (default:
+    the goal, so distances are optimal solution lengths).
+
+    Memory stays around ``chunk_records`` child records (9 bytes each, plus
+    sorting space) however large the space is.  The disk holds one layer and
+    the chunks of the next, in ``spill_dir`` (default: the system temporary
+    directory).  ``progress`` is called once per block of BLOCK_RECORDS
+    expanded states and may raise SearchCancelled.  Boards up to 4x4.
+    """
+    if initial_state is None:
+        initial_state = PuzzleSolver.goal_state(width)
+    board = board_for(initial_state)
+    if not board.fits_64_bits:
+        raise ValueError(f"Frontier search supports boards up to 4x4, got "
+                         f"{board.width}x{board.width}")
+    cells, bits = board.size, board.tile_bits
+    # Per move direction: id, blank offset and a mask of the blank positions
+    # it is legal from.  MOVE_NAMES pairs inverse moves, so id ^ 1 undoes id.
+    directions = []
+    for move_id, name in enumerate(MOVE_NAMES):
+        allowed = np.zeros(cells, dtype=bool)
+        for blank_pos in range(cells):
+            allowed[blank_pos] = any(move == name for move, _ in
+                                     PuzzleSolver.get_possible_moves(blank_pos, board.width))
+        directions.append((move_id, board.moves[name], allowed, np.uint8(1 << (move_id ^ 1))))
+
+    work_dir = tempfile.mkdtemp(prefix='frontier-', dir=spill_dir)
+    try:
+        layer_path = os.path.join(work_dir, 'layer-0')
+        writer = _ChunkWriter(layer_path)
+        writer.write(np.array([encode_state(initial_state)], dtype=np.uint64),
+                     np.zeros(1, dtype=np.uint8))
+        writer.close()
+        depth_counts = [1]
+        bytes_spilled = writer.bytes_written
+        nodes_explored = 0
+        peak_records = 0
+        complete = False
+
+        while max_depth is None or len(depth_counts) <= max_depth:
+            depth = len(depth_counts)
+            chunk_paths = []
+            code_parts, op_parts = [], []
+            buffered = 0
+
+            def spill() -> None:
+                nonlocal bytes_spilled, buffered
+                chunk = _ChunkWriter(os.path.join(work_dir, f'chunk-{depth}-{len(chunk_paths)}'))
+                chunk.write(*_deduplicate(np.concatenate(code_parts), np.concatenate(op_parts)))
+                chunk.close()
+                chunk_paths.append(chunk.path)
+                bytes_spilled += chunk.bytes_written
+                code_parts.clear()
+                op_parts.clear()
+                buffered = 0
+
+            for codes, ops in _read_blocks(layer_path):
+                tiles = decode(codes, cells, bits)
+                blanks = np.argmax(tiles == 0, axis=1)
+                for move_id, offset, allowed, back in directions:
+                    selected = np.nonzero(allowed[blanks] & ((ops & (1 << move_id)) == 0))[0]
+                    if not len(selected):
+                        continue
+                    blank_pos = blanks[selected].astype(np.uint64)
+                    new_pos = blanks[selected] + offset
+                    tile = tiles[selected, new_pos].astype(np.uint64)
+                    code_parts.append(codes[selected] + (tile << (blank_pos * np.uint64(bits)))
+                                      - (tile << (new_pos.astype(np.uint64) * np.uint64(bits))))
+                    op_parts.append(np.full(len(selected), back, dtype=np.uint8))
+                    buffered += len(selected)
+                peak_records = max(peak_records, buffered)
+                if buffered >= chunk_records:
+                    spill()
+                nodes_explored += len(codes)
+                if progress is not None:
+                    progress(nodes_explored, depth_counts[-1])
+            if buffered:
+                spill()
+            if not chunk_paths:
+                complete = True
+                break
+
+            next_path = os.path.join(work_dir, f'layer-{depth}')
+            writer = _ChunkWriter(next_path)
+            _merge(chunk_paths, writer)
+            writer.close()
+            bytes_spilled += writer.bytes_written
+            for path in chunk_paths + [layer_path]:
+                os.remove(path)
+            layer_path = next_path
+            depth_counts.append(writer.records)
+
+        hardest = []
+        blocks = _read_blocks(layer_path)
+        for codes, _ in blocks:
+            hardest.extend(decode_state(int(code), cells)
+                           for code in codes[:keep_hardest - len(hardest)])
+            if len(hardest) >= keep_hardest:
+                break
+        blocks.close()
+        return FrontierCensus(board.width, depth_counts, hardest, complete, nodes_explored,
+                              bytes_spilled, peak_records)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Count sliding-puzzle states by optimal solution length.")
+    parser.add_argument('--width', type=int, default=3, help="board width (default 3, at most 4)")
+    parser.add_argument('--max-depth', type=int, help="stop after this layer (default: exhaust)")
+    parser.add_argument('--hardest', type=int, default=10,
+                        help="states of the deepest layer to print (default 10)")
+    parser.add_argument('--chunk-records', type=int, default=CHUNK_RECORDS,
+                        help=f"child records buffered before spilling (default {CHUNK_RECORDS})")
+    parser.add_argument('--spill-dir', help="directory for layer files (default: system temp)")
+    args = parser.parse_args(argv)
+
+    def report(nodes_explored: int, frontier_size: int) -> None:
+        print(f"\r{nodes_explored:,} states expanded", end='', file=sys.stderr, flush=True)
+
+    try:
+        census = frontier_bfs(width=args.width, max_depth=args.max_depth,
+                              keep_hardest=args.hardest, chunk_records=args.chunk_records,
+                              spill_dir=args.spill_dir, progress=report)
+    except ValueError as e:
+        parser.error(str(e))
+    print(file=sys.stderr)
+    for depth, count in enumerate(census.depth_counts):
+        print(f"{depth:3d} {count:15,d}")
+    print(f"{census.states:,} states in {census.radius + 1} layers"
+          f"{'' if census.complete else ' (stopped at --max-depth)'}; "
+          f"{census.bytes_spilled / 2 ** 20:.1f} MiB spilled")
+    print(f"{'Hardest' if census.complete else 'Deepest'} states (depth {census.radius}):")
+    for state in census.hardest:
+        print(','.join(map(str, state)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import time
+from math import factorial
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .search import (MOVE_NAMES, ProgressCallback, PuzzleSolver, Replay, SearchStats, board_for,
+                     encode_state)
+
+
+# Layer-synchronous breadth-first search on NumPy arrays.
+#
+# A whole frontier is one uint64 array of encoded states.  Successors of
+# every state in the layer are generated at once, one blank direction at a
+# time, and deduplicated against a visited bitmap indexed by the states'
+# permutation rank.  Parent links live in rank-indexed arrays as well, so
+# the search holds no per-node Python objects.  Because the bitmap has one
+# entry per permutation, the engine is limited to boards whose n! fits in
+# memory, i.e. up to 3x3.
+MAX_CELLS = 9
+NO_PARENT = -1
+
+
+class LayeredSearch:
+    """Result of a sweep: BFS depth, parent rank and move for every rank
+    reached (depth -1 and parent NO_PARENT elsewhere)."""
+
+    def __init__(self, width: int, depth: np.ndarray, parent: np.ndarray, move: np.ndarray,
+                 nodes_explored: int):
+        self.width = width
+        self.depth = depth
+        self.parent = parent
+        self.move = move
+        self.nodes_explored = nodes_explored
+
+    def path_to(self, rank: int) -> Optional[List[str]]:
+        """Moves from the sweep's start state to the state of ``rank``."""
+        if self.depth[rank] < 0:
+            return None
+        path = []
+        while self.parent[rank] != NO_PARENT:
+            path.append(MOVE_NAMES[self.move[rank]])
+            rank = int(self.parent[rank])
+        path.reverse()
+        return path
+
+
+def _weights(cells: int) -> np.ndarray:
+    return np.array([factorial(cells - 1 - i) for i in range(cells)], dtype=np.int64)
+
+
+def decode(codes: np.ndarray, cells: int, bits: int) -> np.ndarray:
+    """(k,) encoded states -> (k, cells) tile arrays."""
+    shifts = np.arange(cells, dtype=np.uint64) * np.uint64(bits)
+    return ((codes[:, None] >> shifts) & np.uint64((1 << bits) - 1)).astype(np.int8)
+
+
+def permutation_ranks(tiles: np.ndarray) -> np.ndarray:
+    """Lexicographic rank of every row of a (k, cells) tile array."""
+    cells = tiles.shape[1]
+    later_and_smaller = (tiles[:, None, :] < tiles[:, :, None]) & np.triu(
+        np.ones((cells, cells), dtype=bool), 1)
+    return later_and_smaller.sum(axis=2, dtype=np.int64) @ _weights(cells)
+
+
+def sweep(initial_state: Optional[List[int]] = None, target: Optional[List[int]] = None,
+          progress: Optional[ProgressCallback] = None, width: int = 3,
+          stats: Optional[SearchStats] = None) -> LayeredSearch:
+    """Breadth-first search from ``initial_state`` (default: the goal).
+
+    Runs until the space is exhausted, or until the layer that reaches
+    ``target`` has been processed.
+    """
+    if initial_state is None:
+        initial_state = PuzzleSolver.goal_state(width)
+    board = board_for(initial_state)
+    cells, bits = board.size, board.tile_bits
+    if cells > MAX_CELLS:
+        raise ValueError(f"The NumPy engine supports boards up to {MAX_CELLS} cells, got {cells}")
+
+    total = factorial(cells)
+    depth = np.full(total, -1, dtype=np.int8)
+    parent = np.full(total, NO_PARENT, dtype=np.int32)
+    move = np.zeros(total, dtype=np.uint8)
+    target_rank = None
+    if target is not None:
+        target_rank = int(permutation_ranks(np.array([target], dtype=np.int8))[0])
+
+    frontier = np.array([encode_state(initial_state)], dtype=np.uint64)
+    frontier_ranks = permutation_ranks(decode(frontier, cells, bits))
+    depth[frontier_ranks] = 0
+    nodes_explored = 0
+    reached = 1
+    level = 0
+    # Per move direction: blank offset and a mask of blank positions it is legal from.
+    legal = {name: np.zeros(cells, dtype=bool) for name in MOVE_NAMES}
+    for blank_pos in range(cells):
+        for name, _ in PuzzleSolver.get_possible_moves(blank_pos, board.width):
+            legal[name][blank_pos] = True
+    directions = [(move_id, board.moves[name], legal[name])
+                  for move_id, name in enumerate(MOVE_NAMES)]
+
+    while len(frontier):
+        nodes_explored += len(frontier)
+        if progress is not None:
+            progress(nodes_explored, len(frontier))
+        if target_rank is not None and depth[target_rank] >= 0:
+            break
+
+        if stats is not None:
+            expand_start = time.perf_counter()
+        tiles = decode(frontier, cells, bits)
+        blanks = np.argmax(tiles == 0, axis=1)
+        children, child_parents, child_moves = [], [], []
+        for move_id, offset, allowed in directions:
+            selected = np.nonzero(allowed[blanks])[0]
+            if not len(selected):
+                continue
+            blank_pos = blanks[selected]
+            new_pos = blank_pos + offset
+            tile = tiles[selected, new_pos].astype(np.uint64)
+            codes = frontier[selected]
+            codes = (codes + (tile << (blank_pos.astype(np.uint64) * np.uint64(bits)))
+                     - (tile << (new_pos.astype(np.uint64) * np.uint64(bits))))
+            children.append(codes)
+            child_parents.append(frontier_ranks[selected])
+            child_moves.append(np.full(len(selected), move_id, dtype=np.uint8))
+
+        codes = np.concatenate(children)
+        ranks = permutation_ranks(decode(codes, cells, bits))
+        # Keep the first occurrence of each new state, then drop those seen before.
+        ranks, first = np.unique(ranks, return_index=True)
+        fresh = depth[ranks] < 0
+        ranks, first = ranks[fresh], first[fresh]
+
+        level += 1
+        depth[ranks] = level
+        parent[ranks] = np.concatenate(child_parents)[first]
+        move[ranks] = np.concatenate(child_moves)[first]
+        if stats is not None:
+            stats.record(level - 1, len(ranks), reached + len(ranks), len(codes), len(ranks),
+                         time.perf_counter() - expand_start, 0, len(frontier))
+            reached += len(ranks)
+        frontier, frontier_ranks = codes[first], ranks
+
+    return LayeredSearch(board.width, depth, parent, move, nodes_explored)
+
+
+def layered_bfs(initial_state: List[int], progress: Optional[ProgressCallback] = None,
+                stats: Optional[SearchStats] = None
+                ) -> Optional[Tuple[List[str], Replay, int]]:
+    """Drop-in for :meth:`PuzzleSolver.bfs` backed by :func:`sweep`.
+    Raises ValueError for boards larger than MAX_CELLS cells."""
+    if len(initial_state) > MAX_CELLS:
+        raise ValueError(f"The NumPy engine supports boards up to {MAX_CELLS} cells, "
+                         f"got {len(initial_state)}")
+    if not PuzzleSolver.is_solvable(initial_state):
+        return None
+    goal = PuzzleSolver.goal_state(board_for(initial_state).width)
+    search = sweep(initial_state, goal, progress, stats=stats)
+    path = search.path_to(int(permutation_ranks(np.array([goal], dtype=np.int8))[0]))
+    return path, PuzzleSolver.replay(initial_state, path), search.nodes_explored
+
+
+def distances(states: List[List[int]], width: int = 3) -> np.ndarray:
+    """Optimal solution lengths of many states from one sweep from the goal
+    (-1 for unsolvable states)."""
+    search = sweep(width=width)
+    ranks = permutation_ranks(np.asarray(states, dtype=np.int8).reshape(-1, width * width))
+    return search.depth[ranks]
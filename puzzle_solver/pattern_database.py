@@ -0,0 +1,253 @@
+import mmap
+import os
+import struct
+from collections import deque
+from math import perm
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .search import DEFAULT_CACHE_DIR, Heuristic, PuzzleSolver, get_board, register_heuristic
+
+
+# Disjoint additive pattern databases.
+#
+# A pattern is a group of tiles; its database stores, for every placement of
+# those tiles, the fewest moves *of pattern tiles* needed to bring them home
+# while all other tiles are indistinguishable.  Because each move slides a
+# single tile, costs of disjoint patterns can be added and the sum is still
+# admissible.  Entries are indexed by the partial-permutation rank of the
+# pattern tiles' positions (see :func:`placement_rank`), one byte each.
+PARTITIONS: Dict[int, Dict[str, Tuple[Tuple[int, ...], ...]]] = {
+    3: {
+        '44': ((1, 2, 3, 4), (5, 6, 7, 8)),
+    },
+    4: {
+        '555': ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)),
+        # Korf & Felner's 6-6-3 split; the two 6-tile tables take a long time
+        # to build in pure Python but only once per cache directory.
+        '663': ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    },
+    5: {
+        '444444': ((1, 2, 6, 7), (3, 4, 5, 8), (9, 10, 14, 15),
+                   (11, 12, 16, 17), (13, 18, 19, 20), (21, 22, 23, 24)),
+    },
+}
+DEFAULT_PARTITIONS = {3: '44', 4: '555', 5: '444444'}
+
+UNREACHED = 0xFF
+FILE_MAGIC = b'PZPD'
+FILE_VERSION = 1
+_HEADER = struct.Struct('<4sHBB')  # magic, version, board width, pattern size
+
+
+def placement_rank(positions: Sequence[int], cells: int) -> int:
+    """Rank of distinct ``positions`` among all ordered placements of
+    ``len(positions)`` items on ``cells`` cells, in ``[0, perm(cells, k))``."""
+    rank = 0
+    for i, pos in enumerate(positions):
+        smaller = 0
+        for earlier in positions[:i]:
+            if earlier < pos:
+                smaller += 1
+        rank = rank * (cells - i) + pos - smaller
+    return rank
+
+
+class PatternDatabase:
+    """Move counts for one pattern on one board size.
+
+    ``data`` is a ``bytearray`` after :meth:`build` or a read-only view of a
+    memory-mapped file after :meth:`load`.
+    """
+
+    def __init__(self, width: int, pattern: Sequence[int], data):
+        self.width = width
+        self.cells = width * width
+        self.pattern = tuple(pattern)
+        if len(data) != perm(self.cells, len(self.pattern)):
+            raise ValueError(f"Expected {perm(self.cells, len(self.pattern))} entries, got {len(data)}")
+        self.data = data
+
+    def lookup(self, positions: Sequence[int]) -> int:
+        """Cost for pattern tiles at ``positions`` (in ``pattern`` order)."""
+        return self.data[placement_rank(positions, self.cells)]
+
+    @classmethod
+    def build(cls, width: int, pattern: Sequence[int]) -> 'PatternDatabase':
+        """Retrograde 0-1 breadth-first search from the goal.
+
+        The search state is the pattern tiles' positions plus the blank's;
+        moving a pattern tile costs 1 and moving any other tile costs 0.
+        Each placement's entry is the minimum over blank positions.
+        """
+        board = get_board(width)
+        cells, k = board.size, len(pattern)
+        blank_radix = cells - k
+        neighbors = [[new_pos for _, new_pos in PuzzleSolver.get_possible_moves(pos, width)]
+                     for pos in range(cells)]
+
+        start = [board.goal.index(tile) for tile in pattern] + [cells - 1]
+        # Queue entries pack the k + 1 positions, 5 bits each, above the cost.
+        shift = 5
+        cost_shift = shift * (k + 1)
+        field = (1 << shift) - 1
+
+        seen = bytearray([UNREACHED]) * perm(cells, k + 1)
+        data = bytearray([UNREACHED]) * perm(cells, k)
+        seen[placement_rank(start, cells)] = 0
+        queue = deque([_pack(start, shift)])
+        while queue:
+            packed = queue.popleft()
+            cost = packed >> cost_shift
+            positions = [(packed >> (shift * i)) & field for i in range(k + 1)]
+            rank = placement_rank(positions, cells)
+            if seen[rank] < cost:
+                continue  # settled earlier through a cheaper path
+            placement = rank // blank_radix
+            if cost < data[placement]:
+                data[placement] = cost
+
+            blank_pos = positions[k]
+            for new_pos in neighbors[blank_pos]:
+                moved = positions.copy()
+                moved[k] = new_pos
+                step = 0
+                for i in range(k):
+                    if positions[i] == new_pos:
+                        moved[i] = blank_pos
+                        step = 1
+                        break
+                new_cost = cost + step
+                new_rank = placement_rank(moved, cells)
+                if new_cost < seen[new_rank]:
+                    seen[new_rank] = new_cost
+                    entry = _pack(moved, shift) | (new_cost << cost_shift)
+                    if step:
+                        queue.append(entry)
+                    else:
+                        queue.appendleft(entry)
+        return cls(width, pattern, data)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(FILE_MAGIC, FILE_VERSION, self.width, len(self.pattern)))
+            f.write(bytes(self.pattern))
+            f.write(self.data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, width: int, pattern: Sequence[int]) -> Optional['PatternDatabase']:
+        """Memory-map a cache file, or return None if it is missing, stale or
+        was built for another pattern."""
+        pattern = tuple(pattern)
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(_HEADER.size + len(pattern))
+                if len(header) != _HEADER.size + len(pattern):
+                    return None
+                if (_HEADER.unpack(header[:_HEADER.size]) != (FILE_MAGIC, FILE_VERSION, width, len(pattern))
+                        or tuple(header[_HEADER.size:]) != pattern):
+                    return None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        offset = _HEADER.size + len(pattern)
+        if len(mapped) != offset + perm(width * width, len(pattern)):
+            mapped.close()
+            return None
+        return cls(width, pattern, memoryview(mapped)[offset:])
+
+
+def database_path(width: int, pattern: Sequence[int], cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    tiles = '-'.join(str(tile) for tile in pattern)
+    return os.path.join(cache_dir, f'pdb_v{FILE_VERSION}_{width}x{width}_{tiles}.bin')
+
+
+_databases: Dict[Tuple[int, Tuple[int, ...]], PatternDatabase] = {}
+
+
+def get_database(width: int, pattern: Sequence[int], cache_dir: str = DEFAULT_CACHE_DIR) -> PatternDatabase:
+    """Return the shared database for ``pattern``, loading it from the cache
+    directory or building (and caching) it on first use."""
+    key = (width, tuple(pattern))
+    database = _databases.get(key)
+    if database is None:
+        path = database_path(width, pattern, cache_dir)
+        database = PatternDatabase.load(path, width, pattern)
+        if database is None:
+            database = PatternDatabase.build(width, pattern)
+            try:
+                database.save(path)
+            except OSError:
+                pass  # a read-only cache directory only costs a rebuild next run
+        _databases[key] = database
+    return database
+
+
+class AdditivePatternDatabase(Heuristic):
+    """Sum of disjoint pattern databases covering every tile.
+
+    Plugs into :meth:`PuzzleSolver.get_heuristic` as ``'pdb'`` with the
+    board's default partition; pass an instance to use another partition.
+    After a move only the database owning the moved tile is consulted again.
+    """
+    name = 'pdb'
+
+    def __init__(self, goal: List[int], partition: Optional[Sequence[Sequence[int]]] = None,
+                 cache_dir: str = DEFAULT_CACHE_DIR):
+        super().__init__(goal)
+        if partition is None:
+            try:
+                partition = PARTITIONS[self.width][DEFAULT_PARTITIONS[self.width]]
+            except KeyError:
+                raise ValueError(f"No default partition for a {self.width}x{self.width} board") from None
+        elif isinstance(partition, str):
+            partition = PARTITIONS[self.width][partition]
+        tiles = sorted(tile for pattern in partition for tile in pattern)
+        if tiles != list(range(1, self.size)):
+            raise ValueError("Partition must use every tile exactly once")
+
+        self.databases = [get_database(self.width, pattern, cache_dir) for pattern in partition]
+        self.owner = [None] * self.size  # tile -> (database index, slot in its pattern)
+        for index, pattern in enumerate(partition):
+            for slot, tile in enumerate(pattern):
+                self.owner[tile] = (index, slot)
+
+    def _positions(self, code: int) -> List[int]:
+        bits, mask = self.tile_bits, self.tile_mask
+        positions = [0] * self.size
+        for pos in range(self.size):
+            positions[(code >> (bits * pos)) & mask] = pos
+        return positions
+
+    def evaluate(self, code: int) -> int:
+        positions = self._positions(code)
+        return sum(database.lookup([positions[tile] for tile in database.pattern])
+                   for database in self.databases)
+
+    def update(self, h: int, new_code: int, tile: int, src: int, dst: int) -> int:
+        index, slot = self.owner[tile]
+        database = self.databases[index]
+        bits, mask = self.tile_bits, self.tile_mask
+        pattern = database.pattern
+        # Positions of this pattern's tiles only; ``tile`` is now at ``dst``.
+        wanted = {t: i for i, t in enumerate(pattern)}
+        placement = [0] * len(pattern)
+        for pos in range(self.size):
+            i = wanted.get((new_code >> (bits * pos)) & mask)
+            if i is not None:
+                placement[i] = pos
+        new_value = database.lookup(placement)
+        placement[slot] = src
+        return h - database.lookup(placement) + new_value
+
+
+def _pack(positions: Sequence[int], shift: int) -> int:
+    packed = 0
+    for i, pos in enumerate(positions):
+        packed |= pos << (shift * i)
+    return packed
+
+
+register_heuristic(AdditivePatternDatabase)
@@ -0,0 +1,1343 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Sequence
+import importlib
+from itertools import islice
+import heapq
+import os
+import sys
+import time
+
+# Annotations are never evaluated (see the __future__ import), so typing is
+# only needed by type checkers; importing it would more than double the cost
+# of importing this module.  random is imported when a state is generated.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import random
+    from typing import Iterator, List, Optional, Tuple, Union
+
+
+# States are packed into a single integer with a fixed number of bits per
+# tile: the tile at board position i lives in bits [b*i, b*i + b).  The blank
+# (0) therefore occupies an all-zero field, which lets a move be applied with
+# two shifts and an add/subtract instead of copying a list.  Boards up to 4x4
+# use 4 bits per tile; larger boards use as many as their largest tile needs.
+TILE_BITS = 4
+TILE_MASK = (1 << TILE_BITS) - 1
+
+# Where distance tables, pattern databases and the GUI's solution cache live.
+DEFAULT_CACHE_DIR = os.environ.get(
+    'PUZZLE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', '8-puzzle'))
+
+
+def tile_bits(size: int) -> int:
+    """Bits per tile for a board with ``size`` cells."""
+    return max(TILE_BITS, (size - 1).bit_length())
+
+
+def board_width(size: int) -> int:
+    width = int(round(size ** 0.5))
+    if width < 2 or width * width != size:
+        raise ValueError(f"A board needs a square number of cells (4, 9, 16, ...), got {size}")
+    return width
+
+
+# Searches call ``progress(nodes_explored, frontier_size)`` every
+# PROGRESS_INTERVAL expansions when a callback is given.  The callback may
+# raise SearchCancelled to abort the search; the exception propagates to the
+# caller unchanged.
+PROGRESS_INTERVAL = 4096
+ProgressCallback = Callable[[int, int], None]
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+class SearchStats:
+    """Opt-in search instrumentation.
+
+    Pass an instance as ``stats=`` to a solver and it is updated once per
+    expanded node; solvers given no ``stats`` only pay a ``None`` check per
+    node.  ``expansion_time`` is the time spent generating and filing a
+    node's successors.  Everything else (frontier pops, goal tests,
+    progress callbacks, path reconstruction) is bookkeeping, which is only
+    known once :func:`profile_search` has timed the whole call.
+    """
+    __slots__ = ('expanded', 'generated', 'duplicates', 'max_frontier', 'max_stored',
+                 'depth_counts', 'heuristic_evaluations', 'expansion_time', 'elapsed',
+                 'peak_memory')
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0             # successors dropped as already seen
+        self.max_frontier = 0
+        self.max_stored = 0             # most nodes held in memory at once
+        self.depth_counts: List[int] = []  # expanded nodes per depth
+        self.heuristic_evaluations = 0
+        self.expansion_time = 0.0
+        self.elapsed = 0.0
+        self.peak_memory: Optional[int] = None  # bytes, when traced
+
+    def record(self, depth: int, frontier: int, stored: int, generated: int, added: int,
+               seconds: float, evaluations: int = 0, count: int = 1) -> None:
+        """Account for one expanded node, or ``count`` nodes of the same
+        depth expanded together."""
+        self.expanded += count
+        self.generated += generated
+        self.duplicates += generated - added
+        self.heuristic_evaluations += evaluations
+        self.expansion_time += seconds
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+        if stored > self.max_stored:
+            self.max_stored = stored
+        depth_counts = self.depth_counts
+        while len(depth_counts) <= depth:
+            depth_counts.append(0)
+        depth_counts[depth] += count
+
+    @property
+    def bookkeeping_time(self) -> float:
+        return max(0.0, self.elapsed - self.expansion_time)
+
+    def as_dict(self) -> dict:
+        stats = {name: getattr(self, name) for name in self.__slots__}
+        stats['bookkeeping_time'] = self.bookkeeping_time
+        return stats
+
+
+def profile_search(solve_function: Callable, initial_state: List[int], trace_memory: bool = False,
+                   **kwargs) -> Tuple[Optional[Tuple[List[str], 'Replay', int]], SearchStats]:
+    """Run ``solve_function(initial_state, stats=..., **kwargs)`` and return
+    its result with the filled-in :class:`SearchStats`.  ``trace_memory``
+    also records peak traced memory, at a large cost in speed."""
+    stats = SearchStats()
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    try:
+        result = solve_function(initial_state, stats=stats, **kwargs)
+    finally:
+        stats.elapsed = time.perf_counter() - start_time
+        if trace_memory:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result, stats
+
+
+# A partial result: the state a search rated nearest the goal, the moves
+# leading to it from the start, and its heuristic value.
+Closest = tuple[list[int], list[str], int]
+
+
+def resident_memory() -> Optional[int]:
+    """Resident set size of this process in bytes, or None where it cannot
+    be read.  Without /proc this is the peak size rather than the current one."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class BudgetExhausted(SearchCancelled):
+    """Raised out of a solver whose :class:`SearchBudget` ran out.
+
+    ``reason`` is ``'max_nodes'``, ``'max_memory'`` or ``'deadline'``;
+    ``closest`` is the solver's best partial result (see :data:`Closest`),
+    or None when it has nothing to offer.
+    """
+
+    def __init__(self, reason: str, nodes_explored: int, closest: Optional[Closest] = None):
+        super().__init__(f"{reason} budget exhausted after {nodes_explored} nodes")
+        self.reason = reason
+        self.nodes_explored = nodes_explored
+        self.closest = closest
+
+
+class SearchBudget:
+    """Limits on a single search: expanded nodes, growth of the process's
+    resident memory in bytes, and wall-clock seconds (None: unlimited).
+
+    Pass as ``budget=`` to any solver, which then raises
+    :class:`BudgetExhausted` when a limit is hit, or run the solver through
+    :meth:`PuzzleSolver.solve_within` to get a :class:`SearchOutcome`
+    instead.  Solvers stop at exactly ``max_nodes`` expansions; memory and
+    time are checked where they report progress, every PROGRESS_INTERVAL
+    nodes (every layer for ``layered_bfs``, which checks all three there),
+    so a search may overrun those by that much.  Solvers without a heuristic
+    of their own rate partial results with ``heuristic``.
+    """
+    __slots__ = ('max_nodes', 'max_memory', 'time_limit', 'heuristic')
+
+    def __init__(self, max_nodes: Optional[int] = None, max_memory: Optional[int] = None,
+                 time_limit: Optional[float] = None,
+                 heuristic: Union[str, 'Heuristic'] = 'manhattan'):
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.time_limit = time_limit
+        self.heuristic = heuristic
+
+    @property
+    def node_limit(self) -> int:
+        """The node count at which a solver must report progress outside
+        its PROGRESS_INTERVAL schedule so that ``max_nodes`` is exact; 0
+        (never reached) when nodes are unlimited."""
+        return 0 if self.max_nodes is None else max(self.max_nodes, 1)
+
+    def estimate(self, width: int) -> 'Heuristic':
+        return PuzzleSolver.get_heuristic(self.heuristic, width)
+
+    def watch(self, progress: Optional[ProgressCallback] = None,
+              closest: Optional[Callable[[], Optional[Closest]]] = None) -> ProgressCallback:
+        """A progress callback that enforces this budget from now on and
+        otherwise forwards to ``progress``.  ``closest`` is asked for the
+        partial result when the budget runs out."""
+        max_nodes = self.max_nodes
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        memory_limit = None
+        if self.max_memory is not None:
+            baseline = resident_memory()
+            if baseline is not None:
+                memory_limit = baseline + self.max_memory
+
+        def check(nodes_explored: int, frontier_size: int) -> None:
+            if max_nodes is not None and nodes_explored >= max_nodes:
+                reason = 'max_nodes'
+            elif deadline is not None and time.perf_counter() >= deadline:
+                reason = 'deadline'
+            elif memory_limit is not None and (resident_memory() or 0) > memory_limit:
+                reason = 'max_memory'
+            else:
+                if progress is not None:
+                    progress(nodes_explored, frontier_size)
+                return
+            raise BudgetExhausted(reason, nodes_explored, None if closest is None else closest())
+        return check
+
+
+class SearchOutcome:
+    """Result of :meth:`PuzzleSolver.solve_within`.
+
+    ``status`` is ``'solved'``, ``'no_solution'`` (the solver returned None)
+    or the ``reason`` of the budget that ran out.  ``path`` and ``states``
+    hold a solution whenever there is one, including the best one an
+    anytime search had found when its budget ran out; ``closest`` is the
+    partial result, which is the goal (h = 0) once a solution is known.
+    """
+    __slots__ = ('status', 'nodes_explored', 'path', 'states', 'closest')
+
+    def __init__(self, status: str, nodes_explored: int, path: Optional[List[str]] = None,
+                 states: Optional['Replay'] = None, closest: Optional[Closest] = None):
+        self.status = status
+        self.nodes_explored = nodes_explored
+        self.path = path
+        self.states = states
+        self.closest = closest
+
+    @property
+    def solved(self) -> bool:
+        return self.path is not None
+
+    def __repr__(self) -> str:
+        moves = None if self.path is None else len(self.path)
+        return (f"SearchOutcome({self.status!r}, nodes_explored={self.nodes_explored}, "
+                f"moves={moves})")
+
+
+def closest_along(initial_state: List[int], path: List[str],
+                  estimate: 'Heuristic') -> Closest:
+    """The state on ``path`` from ``initial_state`` that ``estimate`` rates
+    nearest the goal (the earliest one on ties)."""
+    best = None
+    for depth, state in enumerate(PuzzleSolver.iter_states(initial_state, path)):
+        h = estimate.evaluate(encode_state(state))
+        if best is None or h < best[2]:
+            best = (state, path[:depth], h)
+    return best
+
+
+# Iterative deepening gives up beyond IDDFS_MAX_DEPTH moves (80 is the
+# longest optimal 4x4 solution) and remembers at most IDDFS_TABLE_SIZE
+# states per iteration.
+IDDFS_MAX_DEPTH = 80
+IDDFS_TABLE_SIZE = 1 << 20
+
+# Budgeted searches rate at most PARTIAL_SCAN_LIMIT frontier nodes when
+# picking their partial result.  Anytime A* starts out weighting the
+# heuristic by ANYTIME_WEIGHT.
+PARTIAL_SCAN_LIMIT = 1 << 16
+ANYTIME_WEIGHT = 2.0
+
+
+def encode_state(state: List[int]) -> int:
+    bits = tile_bits(len(state))
+    code = 0
+    for pos, tile in enumerate(state):
+        code |= tile << (bits * pos)
+    return code
+
+
+def decode_state(code: int, size: int = 9) -> List[int]:
+    bits = tile_bits(size)
+    mask = (1 << bits) - 1
+    return [(code >> (bits * pos)) & mask for pos in range(size)]
+
+
+class Board:
+    """Geometry of a ``width`` x ``width`` puzzle, built once per size and
+    shared by every search on that size (see :func:`get_board`)."""
+
+    def __init__(self, width: int):
+        self.width = width
+        self.size = width * width
+        self.tile_bits = tile_bits(self.size)
+        self.tile_mask = (1 << self.tile_bits) - 1
+        self.goal = list(range(1, self.size)) + [0]
+        self.goal_code = encode_state(self.goal)
+        self.moves = {'UP': -width, 'DOWN': width, 'LEFT': -1, 'RIGHT': 1}
+        # Codes of boards up to 4x4 fit in an unsigned 64-bit array slot.
+        self.fits_64_bits = self.size * self.tile_bits <= 64
+        # Per blank position: (move, new blank position, bit offset of the
+        # tile being slid, bit offset of the blank), so the search loops never
+        # recompute shifts.
+        self.transitions = tuple(
+            tuple((move, new_pos, self.tile_bits * new_pos, self.tile_bits * blank_pos)
+                  for move, new_pos in PuzzleSolver.get_possible_moves(blank_pos, width))
+            for blank_pos in range(self.size)
+        )
+        # Same table with moves as indices into MOVE_NAMES, for NodeStore.
+        self.indexed_transitions = tuple(
+            tuple((MOVE_IDS[move], new_pos, shift_new, shift_blank)
+                  for move, new_pos, shift_new, shift_blank in row)
+            for row in self.transitions
+        )
+
+
+_BOARDS = {}
+
+
+def get_board(width: int) -> Board:
+    board = _BOARDS.get(width)
+    if board is None:
+        board = _BOARDS[width] = Board(width)
+    return board
+
+
+def board_for(state: List[int]) -> Board:
+    """The :class:`Board` matching a state's length (9 cells -> 3x3, ...)."""
+    return get_board(board_width(len(state)))
+
+
+class Heuristic:
+    """Admissible estimate of the number of moves left to reach the goal.
+
+    ``evaluate`` scores an encoded state from scratch; ``update`` is called
+    after the tile ``tile`` slid from board position ``src`` to ``dst`` and
+    may use the parent's value ``h`` to avoid a full recomputation.
+    """
+    name = ''
+
+    def __init__(self, goal: List[int]):
+        self.goal = goal
+        self.size = len(goal)
+        self.width = board_width(self.size)
+        self.tile_bits = tile_bits(self.size)
+        self.tile_mask = (1 << self.tile_bits) - 1
+        self.goal_pos = [0] * self.size
+        for pos, tile in enumerate(goal):
+            self.goal_pos[tile] = pos
+
+    def evaluate(self, code: int) -> int:
+        raise NotImplementedError
+
+    def update(self, h: int, new_code: int, tile: int, src: int, dst: int) -> int:
+        return self.evaluate(new_code)
+
+    def __call__(self, state: Union[int, List[int]]) -> int:
+        if not isinstance(state, int):
+            state = encode_state(state)
+        return self.evaluate(state)
+
+
+class MisplacedTiles(Heuristic):
+    name = 'misplaced'
+
+    def evaluate(self, code: int) -> int:
+        goal, bits, mask = self.goal, self.tile_bits, self.tile_mask
+        return sum(1 for pos in range(self.size)
+                   if (code >> (bits * pos)) & mask not in (0, goal[pos]))
+
+    def update(self, h: int, new_code: int, tile: int, src: int, dst: int) -> int:
+        goal_pos = self.goal_pos[tile]
+        return h + (dst != goal_pos) - (src != goal_pos)
+
+
+class ManhattanDistance(Heuristic):
+    name = 'manhattan'
+
+    def __init__(self, goal: List[int]):
+        super().__init__(goal)
+        width = self.width
+        # distance[tile][pos]: moves needed to bring ``tile`` home from ``pos``.
+        self.distance = [
+            [0] * self.size if tile == 0 else
+            [abs(pos // width - self.goal_pos[tile] // width) +
+             abs(pos % width - self.goal_pos[tile] % width)
+             for pos in range(self.size)]
+            for tile in range(self.size)
+        ]
+
+    def evaluate(self, code: int) -> int:
+        distance, bits, mask = self.distance, self.tile_bits, self.tile_mask
+        total = 0
+        for pos in range(self.size):
+            total += distance[(code >> (bits * pos)) & mask][pos]
+        return total
+
+    def update(self, h: int, new_code: int, tile: int, src: int, dst: int) -> int:
+        row = self.distance[tile]
+        return h + row[dst] - row[src]
+
+
+class LinearConflict(ManhattanDistance):
+    """Manhattan distance plus two moves for every tile that has to leave its
+    goal row or column to let another tile in the same line pass."""
+    name = 'linear_conflict'
+
+    def evaluate(self, code: int) -> int:
+        return super().evaluate(code) + self._conflicts(decode_state(code, self.size))
+
+    def update(self, h: int, new_code: int, tile: int, src: int, dst: int) -> int:
+        return self.evaluate(new_code)
+
+    def _conflicts(self, state: List[int]) -> int:
+        width, goal_pos = self.width, self.goal_pos
+        extra = 0
+        for line in range(width):
+            # Goal columns of the tiles already in their goal row, left to right,
+            # and goal rows of the tiles already in their goal column, top down.
+            in_row = [goal_pos[t] % width for t in state[line * width:(line + 1) * width]
+                      if t and goal_pos[t] // width == line]
+            in_col = [goal_pos[t] // width for t in state[line::width]
+                      if t and goal_pos[t] % width == line]
+            extra += _removals_to_sort(in_row) + _removals_to_sort(in_col)
+        return 2 * extra
+
+
+def _removals_to_sort(values: List[int]) -> int:
+    """Fewest items to drop from ``values`` so the rest is increasing."""
+    tails = []
+    for value in values:
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tails[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(tails):
+            tails.append(value)
+        else:
+            tails[lo] = value
+    return len(values) - len(tails)
+
+
+MOVE_NAMES = ('UP', 'DOWN', 'LEFT', 'RIGHT')
+MOVE_IDS = {move: move_id for move_id, move in enumerate(MOVE_NAMES)}
+
+
+class NodeStore:
+    """Search nodes kept column-wise in typed arrays; a node is its index.
+
+    Each node costs about 18 bytes across the columns (state code, parent
+    index, move, blank position, path cost) instead of a Python object with
+    a boxed field per attribute.  Paths are rebuilt by following parent
+    indices from a node back to the root (parent -1).
+    """
+    __slots__ = ('codes', 'parents', 'moves', 'blanks', 'costs')
+
+    def __init__(self, board: Board):
+        self.codes = array('Q') if board.fits_64_bits else []
+        self.parents = array('i')
+        self.moves = array('B')
+        self.blanks = array('B')
+        self.costs = array('I')
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def add(self, code: int, parent: int, move: int, blank: int, cost: int) -> int:
+        self.codes.append(code)
+        self.parents.append(parent)
+        self.moves.append(move)
+        self.blanks.append(blank)
+        self.costs.append(cost)
+        return len(self.parents) - 1
+
+    def reconstruct_path(self, index: int, size: int) -> Tuple[List[str], 'Replay']:
+        codes, parents, moves = self.codes, self.parents, self.moves
+        path = []
+        while parents[index] >= 0:
+            path.append(MOVE_NAMES[moves[index]])
+            index = parents[index]
+        path.reverse()
+        return path, Replay(decode_state(codes[index], size), path)
+
+    def closest(self, nodes, estimate: 'Heuristic', size: int) -> Optional[Closest]:
+        """Of the first PARTIAL_SCAN_LIMIT node indices in ``nodes``, the
+        one ``estimate`` rates nearest the goal, as a partial result.  The
+        root (node 0, the start state) is always a candidate, so a search
+        stopped before it queued anything still gets the start state and an
+        empty path; None only for an empty store."""
+        codes, evaluate = self.codes, estimate.evaluate
+        if not codes:
+            return None
+        best = best_h = None
+        for index in islice(nodes, PARTIAL_SCAN_LIMIT):
+            h = evaluate(codes[index])
+            if best_h is None or h < best_h:
+                best, best_h = index, h
+        root_h = evaluate(codes[0])
+        if best_h is None or root_h < best_h:
+            best, best_h = 0, root_h
+        return decode_state(codes[best], size), self.reconstruct_path(best, size)[0], best_h
+
+
+class Replay(Sequence):
+    """The states visited along a solution, replayed from its moves on
+    demand rather than stored.
+
+    Solvers return one of these as the second item of their result, so a
+    solution costs one list entry per move however long it is.  Iterating is
+    O(1) per state; indexing replays up to the index, so prefer iteration
+    (or :meth:`PuzzleSolver.iter_states`) when walking the whole path.
+    """
+    __slots__ = ('initial_state', 'path')
+
+    def __init__(self, initial_state: List[int], path: List[str]):
+        self.initial_state = list(initial_state)
+        self.path = path
+
+    def __len__(self) -> int:
+        return len(self.path) + 1
+
+    def __iter__(self) -> Iterator[List[int]]:
+        return PuzzleSolver.iter_states(self.initial_state, self.path)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Replay index out of range")
+        return next(islice(iter(self), index, None))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, Replay)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Replay({self.initial_state!r}, {len(self.path)} moves)"
+
+
+class PuzzleNode:
+    __slots__ = ('state', 'parent', 'action', 'cost', 'blank')
+
+    def __init__(self, state: int, parent: Optional['PuzzleNode'] = None, 
+                 action: str = "", cost: int = 0, blank: int = 0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+        self.blank = blank
+    
+    def __lt__(self, other):
+        return self.cost < other.cost
+
+
+class PuzzleSolver:
+    GOAL_STATE = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    GOAL_CODE = encode_state(GOAL_STATE)
+    MOVES = {'UP': -3, 'DOWN': 3, 'LEFT': -1, 'RIGHT': 1}
+
+    @staticmethod
+    def goal_state(width: int = 3) -> List[int]:
+        return list(get_board(width).goal)
+
+    @staticmethod
+    def get_heuristic(heuristic: Union[str, Heuristic] = 'manhattan', width: int = 3) -> Heuristic:
+        if isinstance(heuristic, Heuristic):
+            if heuristic.width != width:
+                raise ValueError(f"Heuristic built for a {heuristic.width}x{heuristic.width} "
+                                 f"board used on a {width}x{width} board")
+            return heuristic
+        estimate = _HEURISTICS.get((heuristic, width))
+        if estimate is None:
+            if heuristic not in _HEURISTIC_TYPES and heuristic in _HEURISTIC_MODULES:
+                importlib.import_module(_HEURISTIC_MODULES[heuristic])
+            try:
+                heuristic_type = _HEURISTIC_TYPES[heuristic]
+            except KeyError:
+                raise ValueError(f"Unknown heuristic: {heuristic!r}") from None
+            estimate = _HEURISTICS[heuristic, width] = heuristic_type(get_board(width).goal)
+        return estimate
+
+    @staticmethod
+    def get_blank_position(state: List[int]) -> int:
+        return state.index(0)
+
+    @staticmethod
+    def get_possible_moves(blank_pos: int, width: int = 3) -> List[Tuple[str, int]]:
+        moves = []
+        row, col = divmod(blank_pos, width)
+        
+        if row > 0: moves.append(('UP', blank_pos - width))
+        if row < width - 1: moves.append(('DOWN', blank_pos + width))
+        if col > 0: moves.append(('LEFT', blank_pos - 1))
+        if col < width - 1: moves.append(('RIGHT', blank_pos + 1))
+        
+        return moves
+
+    @staticmethod
+    def get_next_state(state: List[int], blank_pos: int, new_pos: int) -> List[int]:
+        new_state = state.copy()
+        new_state[blank_pos], new_state[new_pos] = new_state[new_pos], new_state[blank_pos]
+        return new_state
+
+    @staticmethod
+    def is_goal_state(state: List[int]) -> bool:
+        return state == board_for(state).goal
+
+    @staticmethod
+    def reconstruct_path(node: PuzzleNode, size: int = 9) -> Tuple[List[str], Replay]:
+        path = []
+        current = node
+        
+        while current.parent is not None:
+            path.append(current.action)
+            current = current.parent
+
+        path.reverse()
+        return path, Replay(decode_state(current.state, size), path)
+
+    @staticmethod
+    def generate_solvable_state(rng: Optional[random.Random] = None, width: int = 3) -> List[int]:
+        """A uniformly random solvable state: shuffle, then, if the result is
+        unsolvable, swap two tiles.  That swap pairs every unsolvable
+        arrangement with exactly one solvable one, so no retries are needed."""
+        if rng is None:
+            import random as rng
+        state = PuzzleSolver.goal_state(width)
+        rng.shuffle(state)
+        if not PuzzleSolver.is_solvable(state):
+            # Swapping any two tiles flips the parity; take the first two
+            # non-blank cells.
+            first, second = [pos for pos, tile in enumerate(state) if tile][:2]
+            state[first], state[second] = state[second], state[first]
+        return state
+
+    @staticmethod
+    def is_solvable(state: List[int]) -> bool:
+        """O(n) test via cycle decomposition.
+
+        Each move swaps the blank with a neighbour: one transposition of the
+        permutation and one step of the blank.  The parity of the
+        permutation (relative to the goal) therefore always matches the
+        parity of the blank's distance from its goal cell, both being even
+        at the goal.
+        """
+        size = len(state)
+        width = board_width(size)
+        # Follow each cell to the goal cell of its tile; a permutation with c
+        # cycles is a product of size - c transpositions.
+        seen = bytearray(size)
+        cycles = 0
+        for start in range(size):
+            if seen[start]:
+                continue
+            cycles += 1
+            pos = start
+            while not seen[pos]:
+                seen[pos] = 1
+                tile = state[pos]
+                pos = tile - 1 if tile else size - 1
+        blank_pos = state.index(0)
+        blank_distance = 2 * (width - 1) - blank_pos // width - blank_pos % width
+        return (size - cycles + blank_distance) % 2 == 0
+
+    @staticmethod
+    def bfs(initial_state: List[int], progress: Optional[ProgressCallback] = None,
+            stats: Optional[SearchStats] = None, budget: Optional[SearchBudget] = None
+            ) -> Optional[Tuple[List[str], Replay, int]]:
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+
+        board = board_for(initial_state)
+        transitions, mask, goal = board.indexed_transitions, board.tile_mask, board.goal_code
+        start = encode_state(initial_state)
+        # Nodes are stored in the order they are queued, so the FIFO queue is
+        # simply every node from ``head`` onwards.
+        store = NodeStore(board)
+        add = store.add
+        add(start, -1, 0, initial_state.index(0), 0)
+        codes, blanks, costs = store.codes, store.blanks, store.costs
+        visited = {start}
+        nodes_explored = 0
+        head = 0
+        node_limit = 0 if budget is None else budget.node_limit
+        if budget is not None:
+            # Newest nodes first: the deepest part of the queue.
+            progress = budget.watch(progress, lambda: store.closest(
+                range(len(codes) - 1, head - 1, -1), budget.estimate(board.width), board.size))
+
+        while head < len(codes):
+            node = head
+            head += 1
+            nodes_explored += 1
+            if progress is not None and (nodes_explored % PROGRESS_INTERVAL == 0
+                                         or nodes_explored == node_limit):
+                progress(nodes_explored, len(codes) - head)
+            
+            code = codes[node]
+            if code == goal:
+                return store.reconstruct_path(node, board.size) + (nodes_explored,)
+
+            blank_pos, cost = blanks[node], costs[node] + 1
+            if stats is not None:
+                expand_start, stored = time.perf_counter(), len(codes)
+            for move, new_pos, shift_new, shift_blank in transitions[blank_pos]:
+                tile = (code >> shift_new) & mask
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                if new_code not in visited:
+                    visited.add(new_code)
+                    add(new_code, node, move, new_pos, cost)
+            if stats is not None:
+                stats.record(cost - 1, len(codes) - head, len(codes), len(transitions[blank_pos]),
+                             len(codes) - stored, time.perf_counter() - expand_start)
+
+        return None
+
+    @staticmethod
+    def dfs(initial_state: List[int], progress: Optional[ProgressCallback] = None,
+            stats: Optional[SearchStats] = None, budget: Optional[SearchBudget] = None
+            ) -> Optional[Tuple[List[str], Replay, int]]:
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+
+        board = board_for(initial_state)
+        transitions, mask, goal = board.indexed_transitions, board.tile_mask, board.goal_code
+        start = encode_state(initial_state)
+        store = NodeStore(board)
+        add = store.add
+        codes, blanks, costs = store.codes, store.blanks, store.costs
+        stack = array('i', [add(start, -1, 0, initial_state.index(0), 0)])
+        visited = {start}
+        nodes_explored = 0
+        node_limit = 0 if budget is None else budget.node_limit
+        if budget is not None:
+            progress = budget.watch(progress, lambda: store.closest(
+                reversed(stack), budget.estimate(board.width), board.size))
+
+        while stack:
+            node = stack.pop()
+            nodes_explored += 1
+            if progress is not None and (nodes_explored % PROGRESS_INTERVAL == 0
+                                         or nodes_explored == node_limit):
+                progress(nodes_explored, len(stack))
+            
+            code = codes[node]
+            if code == goal:
+                return store.reconstruct_path(node, board.size) + (nodes_explored,)
+
+            blank_pos, cost = blanks[node], costs[node] + 1
+            if stats is not None:
+                expand_start, stored = time.perf_counter(), len(codes)
+            for move, new_pos, shift_new, shift_blank in reversed(transitions[blank_pos]):
+                tile = (code >> shift_new) & mask
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                if new_code not in visited:
+                    visited.add(new_code)
+                    stack.append(add(new_code, node, move, new_pos, cost))
+            if stats is not None:
+                stats.record(cost - 1, len(stack), len(codes), len(transitions[blank_pos]),
+                             len(codes) - stored, time.perf_counter() - expand_start)
+
+        return None
+
+    @staticmethod
+    def iddfs(initial_state: List[int], max_depth: int = IDDFS_MAX_DEPTH,
+              table_size: int = IDDFS_TABLE_SIZE, progress: Optional[ProgressCallback] = None,
+              stats: Optional[SearchStats] = None, budget: Optional[SearchBudget] = None
+              ) -> Optional[Tuple[List[str], Replay, int]]:
+        """Iterative-deepening DFS: depth-limited searches with limits 0, 1,
+        ... ``max_depth``, so the first solution found is a shortest one.
+
+        Besides the move that undoes the previous one, a child is pruned when
+        the current iteration already reached it at the same or a smaller
+        depth: that visit had at least as many moves left and failed (or is
+        an ancestor).  The table recording those depths is cleared every
+        iteration and stops taking new states at ``table_size`` entries, so
+        memory stays O(depth + table_size).
+        """
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+
+        board = board_for(initial_state)
+        transitions, mask, goal = board.transitions, board.tile_mask, board.goal_code
+        path = []
+        shallowest = {}  # state code -> smallest depth reached this iteration
+        nodes_explored = 0
+        limit = 0
+        node_limit = 0 if budget is None else budget.node_limit
+        if budget is not None:
+            progress = budget.watch(progress, lambda: closest_along(
+                initial_state, path, budget.estimate(board.width)))
+
+        def search(code: int, blank_pos: int, prev_pos: int, depth: int) -> bool:
+            nonlocal nodes_explored
+            nodes_explored += 1
+            if progress is not None and (nodes_explored % PROGRESS_INTERVAL == 0
+                                         or nodes_explored == node_limit):
+                progress(nodes_explored, len(path))
+            if code == goal:
+                return True
+            if depth == limit:
+                return False
+
+            depth += 1
+            pruned = 0
+            found = False
+            if stats is not None:
+                expand_start = time.perf_counter()
+            for move, new_pos, shift_new, shift_blank in transitions[blank_pos]:
+                if new_pos == prev_pos:
+                    continue
+                tile = (code >> shift_new) & mask
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                seen = shallowest.get(new_code)
+                if seen is not None:
+                    if seen <= depth:
+                        pruned += 1
+                        continue
+                    shallowest[new_code] = depth
+                elif len(shallowest) < table_size:
+                    shallowest[new_code] = depth
+                path.append(move)
+                if stats is None:
+                    found = search(new_code, new_pos, blank_pos, depth)
+                else:
+                    # Keep the subtree's time out of this node's expansion time.
+                    call_start = time.perf_counter()
+                    found = search(new_code, new_pos, blank_pos, depth)
+                    expand_start += time.perf_counter() - call_start
+                if found:
+                    # Leave the move on the path, but still record this
+                    # expansion: every node on the solution path ends here.
+                    break
+                path.pop()
+            if stats is not None:
+                generated = len(transitions[blank_pos]) - (prev_pos >= 0)
+                stats.record(depth - 1, len(path), len(path) + len(shallowest), generated,
+                             generated - pruned, time.perf_counter() - expand_start)
+            return found
+
+        start = encode_state(initial_state)
+        while limit <= max_depth:
+            shallowest.clear()
+            shallowest[start] = 0
+            if search(start, initial_state.index(0), -1, 0):
+                return path, PuzzleSolver.replay(initial_state, path), nodes_explored
+            limit += 1
+        return None
+
+    @staticmethod
+    def ucs(initial_state: List[int], progress: Optional[ProgressCallback] = None,
+            stats: Optional[SearchStats] = None, budget: Optional[SearchBudget] = None
+            ) -> Optional[Tuple[List[str], Replay, int]]:
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+
+        board = board_for(initial_state)
+        transitions, mask, goal = board.indexed_transitions, board.tile_mask, board.goal_code
+        start = encode_state(initial_state)
+        store = NodeStore(board)
+        add = store.add
+        codes, blanks = store.codes, store.blanks
+        # Heap entries are (cost, node index); indices grow monotonically, so
+        # equal costs pop in insertion order.
+        pq = [(0, add(start, -1, 0, initial_state.index(0), 0))]
+        visited = {start}
+        nodes_explored = 0
+        node_limit = 0 if budget is None else budget.node_limit
+        if budget is not None:
+            progress = budget.watch(progress, lambda: store.closest(
+                (node for _, node in pq), budget.estimate(board.width), board.size))
+
+        while pq:
+            cost, node = heapq.heappop(pq)
+            nodes_explored += 1
+            if progress is not None and (nodes_explored % PROGRESS_INTERVAL == 0
+                                         or nodes_explored == node_limit):
+                progress(nodes_explored, len(pq))
+            
+            code = codes[node]
+            if code == goal:
+                return store.reconstruct_path(node, board.size) + (nodes_explored,)
+
+            blank_pos, cost = blanks[node], cost + 1
+            if stats is not None:
+                expand_start, stored = time.perf_counter(), len(codes)
+            for move, new_pos, shift_new, shift_blank in transitions[blank_pos]:
+                tile = (code >> shift_new) & mask
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                if new_code not in visited:
+                    visited.add(new_code)
+                    heapq.heappush(pq, (cost, add(new_code, node, move, new_pos, cost)))
+            if stats is not None:
+                stats.record(cost - 1, len(pq), len(codes), len(transitions[blank_pos]),
+                             len(codes) - stored, time.perf_counter() - expand_start)
+
+        return None
+
+    @staticmethod
+    def bidirectional_bfs(initial_state: List[int], progress: Optional[ProgressCallback] = None,
+                          stats: Optional[SearchStats] = None,
+                          budget: Optional[SearchBudget] = None
+                          ) -> Optional[Tuple[List[str], Replay, int]]:
+        """Breadth-first search from both the start and the goal.
+
+        Whole layers are expanded at a time, always on the side with the
+        smaller frontier, until the two searches touch.  The backward search
+        records the inverse of each move so that its parent chain, read from
+        the meeting state towards the goal, is already a forward path.  The
+        partial result of a budgeted run comes from the forward frontier.
+        """
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+        board = board_for(initial_state)
+        transitions, mask = board.transitions, board.tile_mask
+        start = encode_state(initial_state)
+        if start == board.goal_code:
+            return [], Replay(initial_state, []), 1
+
+        forward_node = PuzzleNode(start, blank=initial_state.index(0))
+        backward_node = PuzzleNode(board.goal_code, blank=board.size - 1)
+        forward_seen = {start: forward_node}
+        backward_seen = {board.goal_code: backward_node}
+        forward_layer, backward_layer = [forward_node], [backward_node]
+        nodes_explored = 0
+        node_limit = 0 if budget is None else budget.node_limit
+        if budget is not None:
+            def closest() -> Closest:
+                evaluate = budget.estimate(board.width).evaluate
+                node = min(islice(forward_layer, PARTIAL_SCAN_LIMIT),
+                           key=lambda node: evaluate(node.state))
+                path = PuzzleSolver.reconstruct_path(node, board.size)[0]
+                return decode_state(node.state, board.size), path, evaluate(node.state)
+            progress = budget.watch(progress, closest)
+
+        while forward_layer and backward_layer:
+            expand_forward = len(forward_layer) <= len(backward_layer)
+            if expand_forward:
+                layer, seen, other_seen = forward_layer, forward_seen, backward_seen
+                other_layer = backward_layer
+            else:
+                layer, seen, other_seen = backward_layer, backward_seen, forward_seen
+                other_layer = forward_layer
+
+            # (total length, this-side node, move, other-side node)
+            best = None
+            next_layer = []
+            for node in layer:
+                nodes_explored += 1
+                if progress is not None and (nodes_explored % PROGRESS_INTERVAL == 0
+                                             or nodes_explored == node_limit):
+                    progress(nodes_explored, len(forward_layer) + len(backward_layer))
+
+                code, blank_pos = node.state, node.blank
+                if stats is not None:
+                    expand_start, queued = time.perf_counter(), len(next_layer)
+                for move, new_pos, shift_new, shift_blank in transitions[blank_pos]:
+                    tile = (code >> shift_new) & mask
+                    new_code = code + (tile << shift_blank) - (tile << shift_new)
+                    if not expand_forward:
+                        move = _INVERSE_MOVES[move]
+                    met = other_seen.get(new_code)
+                    if met is not None:
+                        length = node.cost + 1 + met.cost
+                        if best is None or length < best[0]:
+                            best = (length, node, move, met)
+                    elif new_code not in seen:
+                        child = PuzzleNode(new_code, node, move, node.cost + 1, new_pos)
+                        seen[new_code] = child
+                        next_layer.append(child)
+                if stats is not None:
+                    # Depths are counted from whichever end the node grew from.
+                    stats.record(node.cost, len(layer) + len(next_layer) + len(other_layer),
+                                 len(forward_seen) + len(backward_seen), len(transitions[blank_pos]),
+                                 len(next_layer) - queued, time.perf_counter() - expand_start)
+
+            if best is not None:
+                _, node, move, met = best
+                if expand_forward:
+                    forward_end, backward_start = node, met
+                else:
+                    forward_end, backward_start = met, node
+                path = PuzzleSolver.reconstruct_path(forward_end, board.size)[0]
+                path.append(move)
+                current = backward_start
+                while current.parent is not None:
+                    path.append(current.action)
+                    current = current.parent
+                return path, PuzzleSolver.replay(initial_state, path), nodes_explored
+
+            if expand_forward:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        return None
+
+    @staticmethod
+    def astar(initial_state: List[int], heuristic: Union[str, Heuristic] = 'manhattan',
+              progress: Optional[ProgressCallback] = None, stats: Optional[SearchStats] = None,
+              budget: Optional[SearchBudget] = None
+              ) -> Optional[Tuple[List[str], Replay, int]]:
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+
+        board = board_for(initial_state)
+        transitions, mask, goal = board.indexed_transitions, board.tile_mask, board.goal_code
+        estimate = PuzzleSolver.get_heuristic(heuristic, board.width)
+        start = encode_state(initial_state)
+        h = estimate.evaluate(start)
+        store = NodeStore(board)
+        add = store.add
+        codes, blanks, costs = store.codes, store.blanks, store.costs
+        # Ties on f are broken towards the smaller h (deeper node), then FIFO
+        # through the monotonically growing node index.
+        pq = [(h, h, add(start, -1, 0, initial_state.index(0), 0))]
+        best_cost = {start: 0}
+        nodes_explored = 0
+        node_limit = 0 if budget is None else budget.node_limit
+        if budget is not None:
+            progress = budget.watch(progress, lambda: store.closest(
+                (node for _, _, node in pq), estimate, board.size))
+
+        while pq:
+            _, h, node = heapq.heappop(pq)
+            code = codes[node]
+            if costs[node] > best_cost[code]:
+                continue
+            nodes_explored += 1
+            if progress is not None and (nodes_explored % PROGRESS_INTERVAL == 0
+                                         or nodes_explored == node_limit):
+                progress(nodes_explored, len(pq))
+
+            if code == goal:
+                return store.reconstruct_path(node, board.size) + (nodes_explored,)
+
+            blank_pos = blanks[node]
+            cost = costs[node] + 1
+            if stats is not None:
+                expand_start, stored = time.perf_counter(), len(codes)
+            for move, new_pos, shift_new, shift_blank in transitions[blank_pos]:
+                tile = (code >> shift_new) & mask
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                if cost < best_cost.get(new_code, cost + 1):
+                    best_cost[new_code] = cost
+                    new_h = estimate.update(h, new_code, tile, new_pos, blank_pos)
+                    heapq.heappush(pq, (cost + new_h, new_h,
+                                        add(new_code, node, move, new_pos, cost)))
+            if stats is not None:
+                # Every child that was pushed had its heuristic evaluated.
+                added = len(codes) - stored
+                stats.record(cost - 1, len(pq), len(codes), len(transitions[blank_pos]),
+                             added, time.perf_counter() - expand_start, added)
+
+        return None
+
+    @staticmethod
+    def ida_star(initial_state: List[int], heuristic: Union[str, Heuristic] = 'manhattan',
+                 progress: Optional[ProgressCallback] = None, stats: Optional[SearchStats] = None,
+                 budget: Optional[SearchBudget] = None
+              ) -> Optional[Tuple[List[str], Replay, int]]:
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+
+        board = board_for(initial_state)
+        transitions, mask, goal = board.transitions, board.tile_mask, board.goal_code
+        estimate = PuzzleSolver.get_heuristic(heuristic, board.width)
+        update = estimate.update
+        path = []
+        nodes_explored = 0
+        node_limit = 0 if budget is None else budget.node_limit
+        if budget is not None:
+            progress = budget.watch(progress, lambda: closest_along(initial_state, path, estimate))
+
+        def search(code: int, blank_pos: int, prev_pos: int, g: int, h: int, bound: int) -> int:
+            # Returns -1 once the goal is found, otherwise the smallest f that
+            # exceeded ``bound`` below this node.
+            nonlocal nodes_explored
+            nodes_explored += 1
+            if progress is not None and (nodes_explored % PROGRESS_INTERVAL == 0
+                                         or nodes_explored == node_limit):
+                progress(nodes_explored, len(path))
+            if code == goal:
+                return -1
+
+            next_bound = INFINITY
+            if stats is not None:
+                expand_start = time.perf_counter()
+            for move, new_pos, shift_new, shift_blank in transitions[blank_pos]:
+                if new_pos == prev_pos:
+                    continue
+                tile = (code >> shift_new) & mask
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                new_h = update(h, new_code, tile, new_pos, blank_pos)
+                f = g + 1 + new_h
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                    continue
+                path.append(move)
+                if stats is None:
+                    result = search(new_code, new_pos, blank_pos, g + 1, new_h, bound)
+                else:
+                    # Keep the subtree's time out of this node's expansion time.
+                    call_start = time.perf_counter()
+                    result = search(new_code, new_pos, blank_pos, g + 1, new_h, bound)
+                    expand_start += time.perf_counter() - call_start
+                if result < 0:
+                    # Found: keep the move and fall through to record this
+                    # expansion, as every node on the solution path does.
+                    next_bound = result
+                    break
+                path.pop()
+                next_bound = min(next_bound, result)
+            if stats is not None:
+                generated = len(transitions[blank_pos]) - (prev_pos >= 0)
+                stats.record(g, len(path), len(path), generated, generated,
+                             time.perf_counter() - expand_start, generated)
+            return next_bound
+
+        start = encode_state(initial_state)
+        h = estimate.evaluate(start)
+        bound = h
+        while True:
+            result = search(start, initial_state.index(0), -1, 0, h, bound)
+            if result < 0:
+                return path, PuzzleSolver.replay(initial_state, path), nodes_explored
+            if result == INFINITY:
+                return None
+            bound = result
+
+    @staticmethod
+    def anytime_astar(initial_state: List[int], heuristic: Union[str, Heuristic] = 'manhattan',
+                      weight: float = ANYTIME_WEIGHT,
+                      on_solution: Optional[Callable[[List[str], int], None]] = None,
+                      progress: Optional[ProgressCallback] = None,
+                      stats: Optional[SearchStats] = None, budget: Optional[SearchBudget] = None
+                      ) -> Optional[Tuple[List[str], Replay, int]]:
+        """Anytime weighted A*: a quick suboptimal solution, then better ones.
+
+        Nodes are expanded in order of ``g + weight * h``, which reaches a
+        first solution long before plain A* would.  The search then carries
+        on, pruning every node whose unweighted ``g + h`` cannot beat the
+        best solution so far, and calls ``on_solution(path, nodes_explored)``
+        for each improvement.  When nothing is left to expand the last
+        solution is optimal (for an admissible heuristic) and is returned.
+        Under a ``budget`` the best solution so far is the partial result, so
+        :meth:`solve_within` hands it back when time runs out.
+        """
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+
+        board = board_for(initial_state)
+        transitions, mask, goal = board.indexed_transitions, board.tile_mask, board.goal_code
+        estimate = PuzzleSolver.get_heuristic(heuristic, board.width)
+        start = encode_state(initial_state)
+        h = estimate.evaluate(start)
+        store = NodeStore(board)
+        add = store.add
+        codes, blanks, costs = store.codes, store.blanks, store.costs
+        pq = [(weight * h, h, add(start, -1, 0, initial_state.index(0), 0))]
+        best_cost = {start: 0}
+        incumbent, incumbent_cost = None, INFINITY
+        nodes_explored = 0
+        node_limit = 0 if budget is None else budget.node_limit
+        if budget is not None:
+            def closest() -> Optional[Closest]:
+                if incumbent is None:
+                    return store.closest((node for _, _, node in pq), estimate, board.size)
+                return list(board.goal), store.reconstruct_path(incumbent, board.size)[0], 0
+            progress = budget.watch(progress, closest)
+
+        while pq:
+            _, h, node = heapq.heappop(pq)
+            code = codes[node]
+            g = costs[node]
+            if g > best_cost[code] or g + h >= incumbent_cost:
+                continue
+            nodes_explored += 1
+            if progress is not None and (nodes_explored % PROGRESS_INTERVAL == 0
+                                         or nodes_explored == node_limit):
+                progress(nodes_explored, len(pq))
+
+            if code == goal:
+                incumbent, incumbent_cost = node, g
+                if on_solution is not None:
+                    on_solution(store.reconstruct_path(node, board.size)[0], nodes_explored)
+                continue
+
+            blank_pos = blanks[node]
+            cost = g + 1
+            if stats is not None:
+                expand_start, stored = time.perf_counter(), len(codes)
+            for move, new_pos, shift_new, shift_blank in transitions[blank_pos]:
+                tile = (code >> shift_new) & mask
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                if cost < best_cost.get(new_code, cost + 1):
+                    new_h = estimate.update(h, new_code, tile, new_pos, blank_pos)
+                    if cost + new_h < incumbent_cost:
+                        best_cost[new_code] = cost
+                        heapq.heappush(pq, (cost + weight * new_h, new_h,
+                                            add(new_code, node, move, new_pos, cost)))
+            if stats is not None:
+                added = len(codes) - stored
+                stats.record(g, len(pq), len(codes), len(transitions[blank_pos]),
+                             added, time.perf_counter() - expand_start, added)
+
+        if incumbent is None:
+            return None
+        return store.reconstruct_path(incumbent, board.size) + (nodes_explored,)
+
+    @staticmethod
+    def solve_optimal(initial_state: List[int], progress: Optional[ProgressCallback] = None,
+                      stats: Optional[SearchStats] = None, budget: Optional[SearchBudget] = None
+                      ) -> Optional[Tuple[List[str], Replay, int]]:
+        """Follow the precomputed distance table downhill to the goal.
+
+        The table (see ``distance_table``) is loaded or built on first call;
+        afterwards every solve is a handful of lookups per move, too few to
+        be worth reporting, so ``progress`` is accepted but never called and
+        ``budget`` is not checked.  Each table lookup counts as a heuristic
+        evaluation in ``stats``.  Raises ValueError for boards other than
+        3x3, which the table does not cover.
+        """
+        if len(initial_state) != 9:
+            raise ValueError("distance table only covers 3x3 boards")
+        if not PuzzleSolver.is_solvable(initial_state):
+            return None
+        from .distance_table import get_distance_table
+        table = get_distance_table()
+
+        code = encode_state(initial_state)
+        blank_pos = initial_state.index(0)
+        distance = table[code]
+        nodes_explored = 1
+        path = []
+        while distance:
+            if stats is not None:
+                expand_start, lookups = time.perf_counter(), nodes_explored
+            for move, new_pos, shift_new, shift_blank in _TRANSITIONS[blank_pos]:
+                tile = (code >> shift_new) & TILE_MASK
+                new_code = code + (tile << shift_blank) - (tile << shift_new)
+                nodes_explored += 1
+                if table[new_code] == distance - 1:
+                    break
+            if stats is not None:
+                lookups = nodes_explored - lookups
+                stats.record(len(path), 1, len(path) + 1, lookups, 1,
+                             time.perf_counter() - expand_start, lookups)
+            path.append(move)
+            code, blank_pos = new_code, new_pos
+            distance -= 1
+
+        return path, PuzzleSolver.replay(initial_state, path), nodes_explored
+
+    @staticmethod
+    def layered_bfs(initial_state: List[int], progress: Optional[ProgressCallback] = None,
+                    stats: Optional[SearchStats] = None, budget: Optional[SearchBudget] = None
+                    ) -> Optional[Tuple[List[str], Replay, int]]:
+        """Breadth-first search that expands a whole layer at a time on NumPy
+        arrays (see ``numpy_bfs``); boards up to 3x3 only (ValueError
+        otherwise).  ``progress`` is called, ``stats`` updated and ``budget``
+        checked once per layer; a budgeted run that stops early has no
+        partial result."""
+        from .numpy_bfs import layered_bfs
+        if budget is not None:
+            progress = budget.watch(progress)
+        return layered_bfs(initial_state, progress, stats)
+
+    @staticmethod
+    def solve_within(solve_function: Callable, initial_state: List[int], budget: SearchBudget,
+                     **kwargs) -> SearchOutcome:
+        """Run ``solve_function(initial_state, budget=budget, **kwargs)`` and
+        report how it ended as a :class:`SearchOutcome`, with the partial
+        result if the budget ran out, rather than raising."""
+        goal = board_for(initial_state).goal
+        try:
+            result = solve_function(initial_state, budget=budget, **kwargs)
+        except BudgetExhausted as e:
+            outcome = SearchOutcome(e.reason, e.nodes_explored, closest=e.closest)
+            if e.closest is not None and e.closest[0] == goal:
+                outcome.path = e.closest[1]
+                outcome.states = Replay(initial_state, outcome.path)
+            return outcome
+        if result is None:
+            return SearchOutcome('no_solution', 0)
+        path, states, nodes_explored = result
+        return SearchOutcome('solved', nodes_explored, path, states, (list(goal), path, 0))
+
+    @staticmethod
+    def replay(initial_state: List[int], path: List[str]) -> Replay:
+        """Every state visited while applying ``path`` to ``initial_state``,
+        as a lazily replayed sequence."""
+        return Replay(initial_state, path)
+
+    @staticmethod
+    def iter_states(initial_state: List[int], path: List[str]) -> Iterator[List[int]]:
+        """Yield ``initial_state`` and then the state after each move of
+        ``path``; each state is a new list."""
+        moves = board_for(initial_state).moves
+        state = list(initial_state)
+        blank_pos = state.index(0)
+        yield state
+        for move in path:
+            new_pos = blank_pos + moves[move]
+            state = PuzzleSolver.get_next_state(state, blank_pos, new_pos)
+            yield state
+            blank_pos = new_pos
+
+
+INFINITY = float('inf')
+
+_INVERSE_MOVES = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+_HEURISTIC_TYPES = {
+    cls.name: cls for cls in (MisplacedTiles, ManhattanDistance, LinearConflict)
+}
+_HEURISTICS = {}  # (name, width) -> shared instance
+# Heuristics living in optional modules, imported on first use by name.
+_HEURISTIC_MODULES = {'pdb': f'{__package__}.pattern_database'}
+
+
+def register_heuristic(heuristic_type: type) -> None:
+    """Make a Heuristic subclass available to get_heuristic by its name."""
+    _HEURISTIC_TYPES[heuristic_type.name] = heuristic_type
+
+# Transition table of the classic 3x3 board, used by the distance table.
+_TRANSITIONS = get_board(3).transitions
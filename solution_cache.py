@@ -0,0 +1,184 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from puzzle_solver import PuzzleSolver, Replay, board_width, encode_state
+
+
+# Solutions are cached under the canonical form of the start state.  Besides
+# the identity, reflecting the board in its main diagonal keeps the blank's
+# goal cell (bottom right) in place; relabelling every tile with the tile
+# whose goal cell is the mirror of its own turns the goal into itself.  A
+# state and its mirror image therefore have mirrored solutions: UP <-> LEFT,
+# DOWN <-> RIGHT.
+_MIRRORED_MOVES = {'UP': 'LEFT', 'LEFT': 'UP', 'DOWN': 'RIGHT', 'RIGHT': 'DOWN'}
+_MOVE_LETTERS = {'UP': 'U', 'DOWN': 'D', 'LEFT': 'L', 'RIGHT': 'R'}
+_LETTER_MOVES = {letter: move for move, letter in _MOVE_LETTERS.items()}
+
+CACHE_VERSION = 1
+
+Result = Tuple[List[str], Replay, int]
+
+
+class _Mirror:
+    """Position and label maps of the diagonal reflection for one width."""
+
+    def __init__(self, width: int):
+        size = width * width
+        self.position = [(pos % width) * width + pos // width for pos in range(size)]
+        goal = PuzzleSolver.goal_state(width)
+        goal_pos = {tile: pos for pos, tile in enumerate(goal)}
+        self.label = [goal[self.position[goal_pos[tile]]] for tile in range(size)]
+
+    def apply(self, state: List[int]) -> List[int]:
+        mirrored = [0] * len(state)
+        for pos, tile in enumerate(state):
+            mirrored[self.position[pos]] = self.label[tile]
+        return mirrored
+
+
+_mirrors: Dict[int, _Mirror] = {}
+
+
+def canonical_form(state: List[int]) -> Tuple[int, bool]:
+    """Return ``(code, mirrored)``: the smaller encoding of ``state`` and its
+    mirror image, and whether the mirror image was the smaller one."""
+    width = board_width(len(state))
+    mirror = _mirrors.get(width)
+    if mirror is None:
+        mirror = _mirrors[width] = _Mirror(width)
+    code = encode_state(state)
+    mirrored_code = encode_state(mirror.apply(state))
+    if mirrored_code < code:
+        return mirrored_code, True
+    return code, False
+
+
+def _valid_entry(entry) -> bool:
+    """Whether ``entry`` is an ``[algorithm, size, code, letters]`` row as
+    written by :meth:`SolutionCache.save`."""
+    if not isinstance(entry, list) or len(entry) != 4:
+        return False
+    algorithm, size, code, letters = entry
+    if letters is not None and not (isinstance(letters, str) and set(letters) <= set(_LETTER_MOVES)):
+        return False
+    return isinstance(algorithm, str) and type(size) is int and type(code) is int
+
+
+class SolutionCache:
+    """Size-bounded LRU cache of solutions in front of any solver.
+
+    Entries are keyed on ``(algorithm, board size, canonical state)`` and hold
+    the solution moves in the canonical frame, so a state and its mirror
+    image share one entry.  Hits replay the moves instead of searching and
+    report zero nodes explored.  With ``path`` set, entries are loaded on
+    construction and written back by :meth:`save`.
+    """
+
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Tuple[str, int, int], Optional[str]]' = OrderedDict()
+        if path is not None and os.path.exists(path):
+            try:
+                self.load(path)
+            except (OSError, ValueError):
+                pass  # an unreadable cache file is as good as an empty cache
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {'entries': len(self._entries), 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+    def lookup(self, algorithm: str, state: List[int]) -> Optional[Result]:
+        """Return the cached result for ``state``, or None on a miss.  A
+        cached "no solution" comes back as ``(None, None, 0)``."""
+        code, mirrored = canonical_form(state)
+        key = (algorithm, len(state), code)
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        letters = self._entries[key]
+        if letters is None:
+            return None, None, 0
+        path = [_LETTER_MOVES[letter] for letter in letters]
+        if mirrored:
+            path = [_MIRRORED_MOVES[move] for move in path]
+        return path, PuzzleSolver.replay(state, path), 0
+
+    def store(self, algorithm: str, state: List[int], path: Optional[List[str]]) -> None:
+        code, mirrored = canonical_form(state)
+        if path is None:
+            letters = None
+        else:
+            if mirrored:
+                path = [_MIRRORED_MOVES[move] for move in path]
+            letters = ''.join(_MOVE_LETTERS[move] for move in path)
+        key = (algorithm, len(state), code)
+        self._entries[key] = letters
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def solve(self, solve_function: Callable[..., Optional[Result]], state: List[int],
+              algorithm: Optional[str] = None, **kwargs) -> Optional[Result]:
+        """Answer from the cache or run ``solve_function(state, **kwargs)``
+        and remember its answer."""
+        algorithm = algorithm or solve_function.__name__
+        cached = self.lookup(algorithm, state)
+        if cached is not None:
+            return None if cached[0] is None else cached
+        result = solve_function(state, **kwargs)
+        self.store(algorithm, state, None if result is None else result[0])
+        return result
+
+    def cached(self, solve_function: Callable[..., Optional[Result]],
+               algorithm: Optional[str] = None) -> Callable[..., Optional[Result]]:
+        """Wrap a solver so every call goes through this cache."""
+        def cached_solve(state: List[int], **kwargs) -> Optional[Result]:
+            return self.solve(solve_function, state, algorithm, **kwargs)
+        cached_solve.__name__ = solve_function.__name__
+        return cached_solve
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given for the solution cache")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': CACHE_VERSION,
+                'entries': [[algorithm, size, code, letters]
+                            for (algorithm, size, code), letters in self._entries.items()],
+            }, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        """Merge entries from a file written by :meth:`save`; files from
+        another cache version are ignored.  Raises ValueError, merging
+        nothing, if the file is not a well-formed cache."""
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path} is not a solution cache")
+        if data.get('version') != CACHE_VERSION:
+            return
+        entries = data.get('entries')
+        if not isinstance(entries, list) or not all(map(_valid_entry, entries)):
+            raise ValueError(f"{path} has malformed solution cache entries")
+        for algorithm, size, code, letters in entries:
+            key = (algorithm, size, code)
+            self._entries[key] = letters
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,292 @@
+"""Asyncio front-end that runs searches on a bounded process pool.
+
+Identical requests that arrive while a search is running share it instead
+of starting another.  Every request may carry a timeout and a node budget,
+both enforced inside the worker (the node budget exactly, the timeout every
+PROGRESS_INTERVAL nodes through the solver's progress callback), and the
+service refuses new work with :class:`ServiceBusy` once too many distinct
+searches are queued.  The stdin/stdout adapter reads one JSON request per
+line and writes one JSON response per line as results complete::
+
+    echo '{"id": 1, "state": "8,6,7,2,5,4,3,0,1", "algorithm": "astar"}' \\
+        | python solve_service.py --workers 4 --timeout 10
+
+Responses carry the request's ``id``; failures carry an ``error`` of
+``"timeout"``, ``"budget"``, ``"busy"``, ``"invalid"`` or, if the search
+itself failed, ``"error"``, plus a ``message``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Set, Tuple
+
+from batch_solve import ALGORITHMS, parse_state
+from puzzle_solver import BudgetExhausted, PuzzleSolver, Replay, SearchBudget, SearchCancelled
+from solution_cache import SolutionCache
+
+
+class ServiceBusy(Exception):
+    """Raised instead of queueing when the service is at capacity."""
+
+
+class SolveTimeout(SearchCancelled):
+    pass
+
+
+class NodeBudgetExceeded(SearchCancelled):
+    pass
+
+
+def _run_search(algorithm: str, state: List[int], max_nodes: Optional[int],
+                deadline: Optional[float]) -> Tuple[Optional[List[str]], int]:
+    """Worker side: run one search under the request's limits and return
+    ``(moves or None, nodes explored)``."""
+    def enforce_deadline(nodes_explored: int, frontier_size: int) -> None:
+        if deadline is not None and time.time() > deadline:
+            raise SolveTimeout(f"gave up after {nodes_explored} nodes at the deadline")
+
+    budget = None if max_nodes is None else SearchBudget(max_nodes=max_nodes)
+    try:
+        result = ALGORITHMS[algorithm](state, progress=enforce_deadline, budget=budget)
+    except BudgetExhausted as e:
+        raise NodeBudgetExceeded(
+            f"gave up after {e.nodes_explored} nodes (budget {max_nodes})") from None
+    if result is None:
+        return None, 0
+    path, _, nodes_explored = result
+    return path, nodes_explored
+
+
+class SolveService:
+    """Coalescing, back-pressured solver front-end.
+
+    At most ``workers`` searches run at once; up to ``max_queue`` more wait
+    for a worker, and requests beyond that raise :class:`ServiceBusy`.
+    Requests coalesce when algorithm, state and node budget match and the
+    running search's deadline is no earlier than the new caller's, so
+    coalesced callers share the outcome, errors included, but each still
+    waits only for its own timeout.  A caller needing more time than the
+    running search has starts a fresh one, which later callers then join.
+    With a ``cache``, hits are answered without touching the pool.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: int = 64,
+                 cache: Optional[SolutionCache] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # The joinable search for each key, with its deadline.
+        self._in_flight: Dict[tuple, Tuple[asyncio.Future, Optional[float]]] = {}
+        self._searches: Set[asyncio.Future] = set()
+        self.counters = {'requests': 0, 'searches': 0, 'coalesced': 0, 'cache_hits': 0,
+                         'rejected': 0, 'timeouts': 0, 'budget_exceeded': 0}
+
+    async def __aenter__(self) -> 'SolveService':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return dict(self.counters, in_flight=len(self._searches))
+
+    async def solve(self, state: List[int], algorithm: str = 'astar',
+                    timeout: Optional[float] = None, max_nodes: Optional[int] = None
+                    ) -> Optional[Tuple[List[str], Replay, int]]:
+        """Solve ``state`` like the synchronous solvers do (None if it has
+        no solution), raising :class:`SolveTimeout`,
+        :class:`NodeBudgetExceeded` or :class:`ServiceBusy`."""
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}")
+        self.counters['requests'] += 1
+        if self.cache is not None:
+            cached = self.cache.lookup(algorithm, state)
+            if cached is not None:
+                self.counters['cache_hits'] += 1
+                return None if cached[0] is None else cached
+
+        key = (algorithm, tuple(state), max_nodes)
+        deadline = None if timeout is None else time.time() + timeout
+        search, search_deadline = self._in_flight.get(key, (None, None))
+        if search is not None and (search_deadline is None or (
+                deadline is not None and deadline <= search_deadline)):
+            self.counters['coalesced'] += 1
+        else:
+            if len(self._searches) >= self.workers + self.max_queue:
+                self.counters['rejected'] += 1
+                raise ServiceBusy(f"{len(self._searches)} searches already in flight")
+            search = self._start(key, algorithm, list(state), max_nodes, deadline)
+
+        try:
+            # Shielded so that one caller giving up does not cancel the
+            # search for the callers coalesced onto it.
+            path, nodes_explored = await asyncio.wait_for(asyncio.shield(search), timeout)
+        except asyncio.TimeoutError:
+            self.counters['timeouts'] += 1
+            raise SolveTimeout(f"no answer within {timeout} seconds") from None
+        except SolveTimeout:
+            self.counters['timeouts'] += 1
+            raise
+        except NodeBudgetExceeded:
+            self.counters['budget_exceeded'] += 1
+            raise
+        if path is None:
+            return None
+        return path, PuzzleSolver.replay(state, path), nodes_explored
+
+    def _start(self, key: tuple, algorithm: str, state: List[int], max_nodes: Optional[int],
+               deadline: Optional[float]) -> asyncio.Future:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        search = loop.run_in_executor(executor, _run_search, algorithm, state, max_nodes,
+                                      deadline)
+        # Replaces a search with an earlier deadline, which keeps running for
+        # the callers already waiting on it.
+        self._in_flight[key] = (search, deadline)
+        self._searches.add(search)
+        self.counters['searches'] += 1
+
+        def finished(search: asyncio.Future) -> None:
+            self._searches.discard(search)
+            if self._in_flight.get(key, (None,))[0] is search:
+                del self._in_flight[key]
+            # Always fetch the exception: every caller may have timed out already.
+            if search.cancelled():
+                return
+            if search.exception() is not None:
+                # A worker that died takes the whole pool with it; start a
+                # fresh one for the next search.
+                if isinstance(search.exception(), BrokenProcessPool) and self._executor is executor:
+                    executor.shutdown(wait=False)
+                    self._executor = None
+                return
+            if self.cache is not None:
+                self.cache.store(algorithm, state, search.result()[0])
+        search.add_done_callback(finished)
+        return search
+
+
+async def _answer(service: SolveService, line_number: int, text: str,
+                  default_timeout: Optional[float], default_max_nodes: Optional[int]) -> dict:
+    response = {'id': line_number}
+    try:
+        request = json.loads(text)
+        response['id'] = request.get('id', line_number)
+        state = request['state']
+        if not isinstance(state, str):
+            state = ','.join(map(str, state))
+        state = parse_state(state)
+        algorithm = request.get('algorithm', 'astar')
+        timeout = request.get('timeout', default_timeout)
+        max_nodes = request.get('max_nodes', default_max_nodes)
+        if timeout is not None and (isinstance(timeout, bool)
+                                    or not isinstance(timeout, (int, float))):
+            raise TypeError(f"timeout must be a number or null, not {timeout!r}")
+        if max_nodes is not None and (isinstance(max_nodes, bool) or not isinstance(max_nodes, int)):
+            raise TypeError(f"max_nodes must be an integer or null, not {max_nodes!r}")
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        response.update(error='invalid', message=str(e))
+        return response
+
+    start_time = time.perf_counter()
+    try:
+        result = await service.solve(state, algorithm, timeout, max_nodes)
+    except SolveTimeout as e:
+        response.update(error='timeout', message=str(e))
+    except NodeBudgetExceeded as e:
+        response.update(error='budget', message=str(e))
+    except ServiceBusy as e:
+        response.update(error='busy', message=str(e))
+    except (ValueError, TypeError) as e:
+        response.update(error='invalid', message=str(e))
+    except Exception as e:
+        # A broken pool or a crashing search must still get its request a
+        # response; the caller only ever sees this one line.
+        response.update(error='error', message=repr(e))
+    else:
+        if result is None:
+            response.update(solved=False, moves=None, path_length=None, nodes_explored=None)
+        else:
+            path, _, nodes_explored = result
+            response.update(solved=True, moves=path, path_length=len(path),
+                            nodes_explored=nodes_explored)
+    response['wall_time'] = time.perf_counter() - start_time
+    return response
+
+
+async def serve_lines(service: SolveService, input_stream=sys.stdin, output=sys.stdout,
+                      default_timeout: Optional[float] = None,
+                      default_max_nodes: Optional[int] = None) -> int:
+    """JSON Lines adapter: answer every request line concurrently and write
+    responses in completion order.  Returns the number of responses."""
+    loop = asyncio.get_running_loop()
+    pending = set()
+    written = 0
+
+    def write(task: asyncio.Task) -> None:
+        nonlocal written
+        output.write(json.dumps(task.result()) + '\n')
+        output.flush()
+        written += 1
+
+    line_number = 0
+    while True:
+        # Reading in a thread keeps the event loop free while waiting for input.
+        text = await loop.run_in_executor(None, input_stream.readline)
+        if not text:
+            break
+        line_number += 1
+        if not text.strip():
+            continue
+        task = asyncio.ensure_future(
+            _answer(service, line_number, text, default_timeout, default_max_nodes))
+        task.add_done_callback(write)
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.wait(pending)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve solve requests as JSON Lines on stdin/stdout.")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--max-queue', type=int, default=64,
+                        help="searches that may wait for a worker before requests are refused")
+    parser.add_argument('--timeout', type=float, help="default per-request timeout in seconds")
+    parser.add_argument('--max-nodes', type=int, help="default per-request node budget")
+    parser.add_argument('--cache', metavar='FILE',
+                        help="reuse and extend a solution cache stored in FILE")
+    parser.add_argument('--cache-size', type=int, default=100000,
+                        help="most solutions kept in the cache (default: 100000)")
+    args = parser.parse_args(argv)
+
+    cache = SolutionCache(args.cache_size, args.cache) if args.cache else None
+    service = SolveService(args.workers, args.max_queue, cache)
+    try:
+        count = asyncio.run(serve_lines(service, default_timeout=args.timeout,
+                                        default_max_nodes=args.max_nodes))
+    finally:
+        service.close()
+        if cache is not None:
+            cache.save()
+    print(f"Wrote {count} responses; {service.stats()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())